@@ -1,41 +1,114 @@
-from datetime import datetime
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Any, Callable
 
-from api.github_client import GitHubClient
-from api.queries import CONTRIBUTIONS_QUERY
-from utils.customDataTypes import GitHubRepository
-from utils.tools import load_json
+from requests import HTTPError
+
+from api.github_client import DEFAULT_TIMEOUT, GitHubClient
+from api.http_cache import ResponseCache
+from api.rate_limiter import scheduler_for
+from api.queries import (
+    CONTRIBUTIONS_QUERY,
+    LANGUAGES_PER_REPOSITORY,
+    REPOSITORIES_LANGUAGES_QUERY,
+    REPOSITORY_LANGUAGES_QUERY,
+    build_contributions_query,
+    chunk_years,
+    contributions_alias,
+)
+from stats.traffic_store import TRAFFIC_DB, TrafficStore
+from utils.customDataTypes import ConfigData, GitHubRepository
+from utils.datastore import datastore_for
+from utils.tools import autocommits_by_year, autocommits_path, load_json
 from utils.helpers.debug import debugLog
 
 
 class GitHubDataFetcher:
 
-    def __init__(self, debug: bool = False) -> None:
+    def __init__(self, debug: bool = False, config: ConfigData | None = None) -> None:
         self.debug = debug
         debugLog(self.__class__, 'Initializing GitHubDataFetcher', debug, 'DEBUG')
 
-        self.username = load_json('config.json')['USERNAME']
-        self.TOKEN = load_json('config.json')['GITHUB_TOKEN']
-        self.visibility = load_json('config.json')['VISIBILITY']
-        self.EXCLUDED_LANGUAGES = load_json('config.json')['EXCLUDED_LANGUAGES']
-        self.client = GitHubClient(self.username, self.TOKEN)
+        if config is None:
+            config = load_json('config.json')
+        self.username = config['USERNAME']
+        self.TOKEN = config['GITHUB_TOKEN']
+        self.visibility = config['VISIBILITY']
+        self.EXCLUDED_LANGUAGES = config['EXCLUDED_LANGUAGES']
+        self.max_workers = max(1, config.get('MAX_WORKERS', 8))
+        self.languages_source = config.get('LANGUAGES_SOURCE', 'rest')
+        cache_dir = config.get('HTTP_CACHE_DIR', 'data/cache/http')
+        self.cache = None if cache_dir is None else ResponseCache(
+            cache_dir, int(config.get('HTTP_CACHE_MAX_MB', 50) * 1024 * 1024), debug
+        )
+        self.client = GitHubClient(
+            self.username, self.TOKEN, debug,
+            pool_size=config.get('HTTP_POOL_SIZE', self.max_workers),
+            timeout=config.get('HTTP_TIMEOUT', DEFAULT_TIMEOUT),
+            cache=self.cache,
+            scheduler=scheduler_for(
+                self.TOKEN,
+                max_retries=config.get('MAX_RETRIES', 5),
+                reserve=config.get('RATE_LIMIT_RESERVE', 50),
+                debug=debug
+            )
+        )
+        self.traffic = TrafficStore(config.get('TRAFFIC_DB', TRAFFIC_DB), debug)
+        self.datastore = datastore_for(config, debug)
         self.api_url = "https://api.github.com/repos"
         debugLog(self.__class__, f'Initialized with username={self.username}', debug, 'DEBUG')
 
+    def close(self) -> None:
+        self.traffic.close()
+        if self.datastore is not None: self.datastore.close()
+
+    def _map_repos(self, fetch: Callable[[dict], Any], repos: list[dict]) -> list[Any]:
+        # Results keep the order of `repos`, whatever order the requests finish in
+        if self.max_workers == 1 or len(repos) < 2:
+            return [fetch(repo) for repo in repos]
+
+        debugLog(self._map_repos, f'Fetching {len(repos)} repositories with {self.max_workers} workers', self.debug, 'DEBUG')
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(repos))) as executor:
+            return list(executor.map(fetch, repos))
+
     def get_profile(self) -> dict[str, Any]:
         debugLog(self.get_profile, 'Fetching profile data', self.debug, 'DEBUG')
         profile = self.client.rest_get("https://api.github.com/user")
         debugLog(self.get_profile, f'Profile data fetched: {profile}', self.debug, 'DEBUG')
         return profile
 
-    def get_repository_views(self, repo_name: str) -> dict[str, int]:
+    def get_repository_views(self, repo_name: str, pushed_at: str | None = None, owner: str | None = None) -> dict[str, Any]:
         debugLog(self.get_repository_views, f'Fetching views for repository: {repo_name}', self.debug, 'DEBUG')
-        response = self.client.rest_get(f'{self.api_url}/{self.username}/{repo_name}/traffic/views')
+
+        # Stored under the owner's login as GitHub spells it, the same key stats.views reads back
+        owner = owner or self.username
+
+        # Already fetched for today's window and nothing pushed since, the store has it
+        window_end = str(date.today())
+        cached = self.traffic.cached_views(owner, repo_name, pushed_at, window_end)
+        if cached is not None:
+            debugLog(self.get_repository_views, f'Views for {repo_name} unchanged since last fetch', self.debug, 'DEBUG')
+            return cached
+
+        try:
+            response = self.client.rest_get(f'{self.api_url}/{owner}/{repo_name}/traffic/views')
+        except HTTPError as error:
+            # Traffic needs push access; a repo we can't read shouldn't sink the whole run.
+            # Anything else (5xx, rate limits past the retries) is an outage, not zero views
+            if error.response is None or error.response.status_code not in (403, 404):
+                raise
+            debugLog(self.get_repository_views, f'No views for {repo_name}: {error}', self.debug, 'WARNING')
+            return {"total_views": 0, "uniques": 0, "daily": []}
         debugLog(self.get_repository_views, f'Views data for {repo_name}: {response}', self.debug, 'DEBUG')
-        return {
+
+        views = {
             "total_views": response.get("count", 0),
-            "uniques": response.get("uniques", 0)
+            "uniques": response.get("uniques", 0),
+            # Per-day series of the 14-day window, merged into the traffic store so history survives beyond it
+            "daily": [[view["timestamp"][:10], view["count"], view["uniques"]] for view in response.get("views", [])]
         }
+        self.traffic.ingest(owner, repo_name, views, pushed_at, window_end)
+        return views
 
     def get_languages(self, repos: dict[str, GitHubRepository], EXCLUDED_LANGUAGES: list = None) -> dict[str, Any]:
         if self.EXCLUDED_LANGUAGES is not None:
@@ -43,9 +116,14 @@ class GitHubDataFetcher:
 
         debugLog(self.get_languages, 'Fetching languages used across repositories', self.debug, 'DEBUG')
 
+        repos_list = list(repos.values())
+        if self.languages_source == 'graphql':
+            repos_languages = self.get_languages_graphql(repos_list)
+        else:
+            repos_languages = self._map_repos(lambda repo: self.client.rest_get(repo["languages_url"]), repos_list)
+
         languages_totals = {}
-        for repo in repos.values():
-            languages = self.client.rest_get(repo["languages_url"])
+        for repo, languages in zip(repos_list, repos_languages):
             debugLog(self.get_languages, f'Languages for repo {repo["name"]}: {languages}', self.debug, 'DEBUG')
             repo['languages'] = languages
 
@@ -56,6 +134,44 @@ class GitHubDataFetcher:
 
         return languages_totals
 
+    def _languages_from_edges(self, languages: dict[str, Any], owner: str, name: str) -> dict[str, int]:
+        result = {edge["node"]["name"]: edge["size"] for edge in languages["edges"]}
+
+        page_info = languages["pageInfo"]
+        while page_info["hasNextPage"]:
+            debugLog(self._languages_from_edges, f'Fetching more languages for {owner}/{name}', self.debug, 'DEBUG')
+            languages = self.client.graphql_query(
+                REPOSITORY_LANGUAGES_QUERY,
+                variables={"owner": owner, "name": name, "cursor": page_info["endCursor"]}
+            )["repository"]["languages"]
+            result.update({edge["node"]["name"]: edge["size"] for edge in languages["edges"]})
+            page_info = languages["pageInfo"]
+
+        return result
+
+    def get_languages_graphql(self, repos_list: list[GitHubRepository]) -> list[dict[str, int]]:
+        # 100 repositories with their language byte counts per request, instead of one REST call per repository
+        debugLog(self.get_languages_graphql, 'Fetching repository languages through GraphQL', self.debug, 'DEBUG')
+
+        privacy = {"public": "PUBLIC", "private": "PRIVATE"}.get(self.visibility)
+        languages_by_repo = {}
+        cursor = None
+        while True:
+            repositories = self.client.graphql_query(
+                REPOSITORIES_LANGUAGES_QUERY,
+                variables={"cursor": cursor, "privacy": privacy, "languages": LANGUAGES_PER_REPOSITORY}
+            )["viewer"]["repositories"]
+
+            for node in repositories["nodes"]:
+                # Same-named repositories of different owners (forks, organisations) must not overwrite each other
+                languages_by_repo[node["nameWithOwner"].lower()] = self._languages_from_edges(node["languages"], node["owner"]["login"], node["name"])
+
+            if not repositories["pageInfo"]["hasNextPage"]:
+                break
+            cursor = repositories["pageInfo"]["endCursor"]
+
+        return [languages_by_repo.get(repo["full_name"].lower(), {}) for repo in repos_list]
+
     def get_contributions_yearly(self, year: int) -> dict[int, dict]:
         # Might update it to fetch contribs per repository
         debugLog(self.get_contributions_yearly, f'Fetching contributions for year {year}', self.debug, 'DEBUG')
@@ -73,24 +189,42 @@ class GitHubDataFetcher:
         debugLog(self.get_contributions_yearly, f'Contributions fetched for {year}', self.debug, 'DEBUG')
         return data
 
-    def get_contributions(self, repos: dict[str, GitHubRepository], creation_date: str) -> tuple[dict[int, dict], dict[str, int]]:
+    def get_contributions_batch(self, years: list[int]) -> dict[int, dict]:
+        # One aliased contributionsCollection per year, chunked to stay under GitHub's query limits
+        debugLog(self.get_contributions_batch, f'Fetching contributions for years {years}', self.debug, 'DEBUG')
+
+        collections = {}
+        for chunk in chunk_years(years):
+            data = self.client.graphql_query(
+                build_contributions_query(chunk),
+                variables={"login": self.username}
+            )["user"]
+            collections.update({year: data[contributions_alias(year)] for year in chunk})
+            debugLog(self.get_contributions_batch, f'Contributions fetched for {chunk}', self.debug, 'DEBUG')
+
+        return collections
+
+    def get_contributions(self, repos: dict[str, GitHubRepository], creation_date: str, years: list[int] | None = None) -> tuple[dict[int, dict], dict[str, int]]:
         # Might update it to fetch contribs per repository
-        debugLog(self.get_contributions, 'Starting get_contributions', self.debug, 'DEBUG')
+        debugLog(self.get_contributions, f'Starting get_contributions for years={years}', self.debug, 'DEBUG')
 
         year_start = datetime.fromisoformat(creation_date.replace('Z', '')).year
         year_end = datetime.now().year
+        if years is None:
+            years = list(range(year_start, year_end + 1))
+        years = [year for year in years if year_start <= year <= year_end]
 
         yearly_data = {}
         all_days = {}
         auto_commits = {}
         try:
-            auto_commits = load_json('data/auto-commits.json')
+            auto_commits = self.datastore.autocommits_by_year(self.username) if self.datastore is not None else autocommits_by_year(load_json(autocommits_path(self.username)))
             debugLog(self.get_contributions, 'Loaded auto-commits data', self.debug, 'DEBUG')
         except FileNotFoundError:
             debugLog(self.get_contributions, 'No auto-commits file found', self.debug, 'WARNING')
 
-        for year in range(year_start, year_end + 1):
-            data = self.get_contributions_yearly(year)
+        collections = self.get_contributions_batch(years)
+        for year, data in collections.items():
             auto_commits_done = 0
             try:
                 if auto_commits.get(str(year), {}).get('auto-commit') is not None:
@@ -136,8 +270,10 @@ class GitHubDataFetcher:
             repos.update({repo['name']: repo for repo in batch})
             page += 1
 
-        for repo in repos.values():
-            repo['views'] = self.get_repository_views(repo['name'])
+        repos_list = list(repos.values())
+        repos_views = self._map_repos(lambda repo: self.get_repository_views(repo['name'], repo.get('pushed_at'), (repo.get('full_name') or '').split('/')[0] or None), repos_list)
+        for repo, views in zip(repos_list, repos_views):
+            repo['views'] = views
 
         debugLog(self.get_repos, f'Final repositories fetched: {list(repos.keys())}', self.debug, 'DEBUG')
         return repos
\ No newline at end of file
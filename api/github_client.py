@@ -1,34 +1,83 @@
+from threading import Lock
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from api.http_cache import ResponseCache
+from api.rate_limiter import RequestScheduler
 from utils.helpers.debug import debugLog
 
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+
+_session: requests.Session | None = None
+_session_pool_size = 0
+_session_lock = Lock()
+
+def get_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    # One keep-alive session per process, shared by every client and asset download.
+    # Auth headers are sent per request, so clients with different tokens can share it.
+    global _session, _session_pool_size
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+        # The pool only grows: a caller asking for more connections than mounted gets a larger adapter,
+        # in-flight requests finish on the previous one
+        if pool_size > _session_pool_size:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+            _session_pool_size = pool_size
+    return _session
+
 class GitHubClient:
-    def __init__(self, USERNAME: str, TOKEN: str, debug: bool = False):
+    def __init__(self, USERNAME: str, TOKEN: str, debug: bool = False,
+                 pool_size: int = DEFAULT_POOL_SIZE, timeout: tuple[float, float] = DEFAULT_TIMEOUT,
+                 cache: ResponseCache | None = None, scheduler: RequestScheduler | None = None):
         self.USERNAME = USERNAME
         self.TOKEN = TOKEN
         self.HEADERS = {"Authorization": f"bearer {TOKEN}"}
         self.debug = debug
+        self.session = get_session(pool_size)
+        self.timeout = tuple(timeout)
+        self.cache = cache
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler(debug=debug)
         debugLog(self.__class__, f'Initialized GitHubClient for user {USERNAME}', self.debug, 'DEBUG')
 
     def rest_get(self, url: str, params: dict = None) -> dict[str, Any]:
         debugLog(self.rest_get, f'Making REST GET request to {url} with params={params}', self.debug, 'DEBUG')
-        response = requests.get(url, params=params, headers=self.HEADERS)
+        cached = self.cache.lookup(url, params, self.USERNAME) if self.cache is not None else None
+        headers = {**self.HEADERS, **ResponseCache.validators(cached)}
+
+        response = self.scheduler.request(
+            lambda: self.session.get(url, params=params, headers=headers, timeout=self.timeout),
+            'core'
+        )
+        if response.status_code == 304 and cached is not None:
+            self.cache.hit(url, params, self.USERNAME)
+            return cached['body']
+
         response.raise_for_status()
         result = response.json()
+        if self.cache is not None:
+            self.cache.store(url, params, self.USERNAME, response.headers, result)
         debugLog(self.rest_get, f'Response received: {result}', self.debug, 'DEBUG')
         return result
 
     def graphql_query(self, query: str, variables: dict = None) -> dict[str, Any]:
         debugLog(self.graphql_query, f'Making GraphQL request with variables={variables}', self.debug, 'DEBUG')
-        response = requests.post(
-            "https://api.github.com/graphql",
-            headers=self.HEADERS,
-            json={
-                "query": query,
-                "variables": variables
-            }
+        response = self.scheduler.request(
+            lambda: self.session.post(
+                "https://api.github.com/graphql",
+                headers=self.HEADERS,
+                json={
+                    "query": query,
+                    "variables": variables
+                },
+                timeout=self.timeout
+            ),
+            'graphql'
         )
         response.raise_for_status()
         debugLog(self.graphql_query, f'GraphQL unfiltered response data: {response.json()}', self.debug, 'DEBUG')
@@ -0,0 +1,120 @@
+import json
+import os
+from hashlib import sha1
+from threading import Lock
+from typing import Any
+
+from utils.helpers.debug import debugLog
+
+CacheEntry = dict[str, Any]
+
+class ResponseCache:
+    """On-disk cache of REST responses, revalidated with ETag/Last-Modified.
+
+    One JSON file per (scope, url, params), evicted least-recently-used once
+    the directory grows over `max_bytes`.
+    """
+
+    def __init__(self, directory: str = 'data/cache/http', max_bytes: int = 50 * 1024 * 1024, debug: bool = False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.debug = debug
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._sizes: dict[str, int] = {
+            entry.name: entry.stat().st_size
+            for entry in os.scandir(self.directory) if entry.name.endswith('.json')
+        }
+        debugLog(self.__class__, f'Loaded {len(self._sizes)} cached responses from {directory}', debug, 'DEBUG')
+
+    @staticmethod
+    def key(url: str, params: dict | None = None, scope: str = '') -> str:
+        raw = json.dumps([scope, url, params or {}], sort_keys=True)
+        return f'{sha1(raw.encode("utf-8")).hexdigest()}.json'
+
+    @staticmethod
+    def validators(entry: CacheEntry | None) -> dict[str, str]:
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def lookup(self, url: str, params: dict | None = None, scope: str = '') -> CacheEntry | None:
+        file_name = self.key(url, params, scope)
+        if file_name not in self._sizes:
+            return None
+        try:
+            with open(os.path.join(self.directory, file_name), 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            debugLog(self.lookup, f'Unreadable cache entry for {url}, ignoring it', self.debug, 'WARNING')
+            return None
+
+    def hit(self, url: str, params: dict | None = None, scope: str = '') -> None:
+        file_name = self.key(url, params, scope)
+        with self._lock:
+            self.hits += 1
+            try:
+                os.utime(os.path.join(self.directory, file_name))
+            except OSError:
+                pass
+        debugLog(self.hit, f'Not modified, served from cache: {url}', self.debug, 'DEBUG')
+
+    def store(self, url: str, params: dict | None, scope: str, headers: dict[str, str], body: Any) -> None:
+        with self._lock:
+            self.misses += 1
+
+        etag, last_modified = headers.get('ETag'), headers.get('Last-Modified')
+        if etag is None and last_modified is None:
+            return
+
+        file_name = self.key(url, params, scope)
+        path = os.path.join(self.directory, file_name)
+        payload = json.dumps({'url': url, 'etag': etag, 'last_modified': last_modified, 'body': body})
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            file.write(payload)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._sizes[file_name] = len(payload)
+            self._evict()
+
+    def _evict(self) -> None:
+        total = sum(self._sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        def last_used(file_name: str) -> float:
+            try:
+                return os.path.getmtime(os.path.join(self.directory, file_name))
+            except OSError:
+                return 0.0
+
+        for file_name in sorted(self._sizes, key=last_used):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, file_name))
+            except OSError:
+                pass
+            total -= self._sizes.pop(file_name)
+            self.evictions += 1
+        debugLog(self._evict, f'Evicted cached responses, {total} bytes left', self.debug, 'DEBUG')
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._sizes),
+            'bytes': sum(self._sizes.values())
+        }
\ No newline at end of file
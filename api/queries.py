@@ -17,4 +17,101 @@ query($login: String!, $from: DateTime!, $to: DateTime!) {
         }
     }
 }
-"""
\ No newline at end of file
+"""
+
+# GitHub caps a query at 500,000 nodes; every year's calendar is ~371 day nodes,
+# so ten years per document stays far below it and keeps each request fast.
+CONTRIBUTIONS_YEARS_PER_QUERY = 10
+
+CONTRIBUTIONS_FRAGMENT = """
+fragment YearContributions on ContributionsCollection {
+    totalCommitContributions
+    totalPullRequestContributions
+    totalIssueContributions
+    contributionCalendar {
+        totalContributions
+        weeks {
+            contributionDays {
+                date
+                contributionCount
+            }
+        }
+    }
+}
+"""
+
+def contributions_alias(year: int) -> str:
+    return f'y{year}'
+
+def chunk_years(years: list[int], size: int = CONTRIBUTIONS_YEARS_PER_QUERY) -> list[list[int]]:
+    return [years[i:i + size] for i in range(0, len(years), size)]
+
+def build_contributions_query(years: list[int]) -> str:
+    collections = '\n'.join(
+        f'        {contributions_alias(year)}: contributionsCollection('
+        f'from: "{year}-01-01T00:00:00", to: "{year}-12-31T23:59:59") {{ ...YearContributions }}'
+        for year in years
+    )
+    return f"""
+query($login: String!) {{
+    user(login: $login) {{
+{collections}
+    }}
+}}
+{CONTRIBUTIONS_FRAGMENT}"""
+
+
+# Languages returned with each repository; repositories with more are paginated
+# one by one through REPOSITORY_LANGUAGES_QUERY
+LANGUAGES_PER_REPOSITORY = 20
+
+REPOSITORIES_LANGUAGES_QUERY = """
+query($cursor: String, $privacy: RepositoryPrivacy, $languages: Int!) {
+    viewer {
+        repositories(first: 100, after: $cursor, privacy: $privacy, ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]) {
+            pageInfo {
+                hasNextPage
+                endCursor
+            }
+            nodes {
+                name
+                nameWithOwner
+                owner {
+                    login
+                }
+                languages(first: $languages, orderBy: {field: SIZE, direction: DESC}) {
+                    pageInfo {
+                        hasNextPage
+                        endCursor
+                    }
+                    edges {
+                        size
+                        node {
+                            name
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+"""
+
+REPOSITORY_LANGUAGES_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+    repository(owner: $owner, name: $name) {
+        languages(first: 100, after: $cursor, orderBy: {field: SIZE, direction: DESC}) {
+            pageInfo {
+                hasNextPage
+                endCursor
+            }
+            edges {
+                size
+                node {
+                    name
+                }
+            }
+        }
+    }
+}
+"""
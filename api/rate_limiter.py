@@ -0,0 +1,131 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from typing import Callable
+
+import requests
+
+from utils.helpers.debug import debugLog
+
+RETRY_STATUSES = {500, 502, 503, 504}
+SECONDARY_LIMIT_WAIT = 60  # GitHub asks to wait at least a minute when no Retry-After is sent
+
+def retry_after_seconds(value: str) -> float | None:
+    # Retry-After is either a number of seconds or an HTTP date
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+class RequestScheduler:
+    """Paces and retries the requests made with one token.
+
+    Budgets are tracked per rate-limit resource ('core', 'graphql', ...) from the
+    X-RateLimit-* response headers. Once fewer than `reserve` calls are left, the
+    remaining ones are spread until the window resets.
+    """
+
+    def __init__(self, max_retries: int = 5, reserve: int = 50, backoff_base: float = 1.0, backoff_max: float = 60.0, debug: bool = False):
+        self.max_retries = max_retries
+        self.reserve = reserve
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.debug = debug
+        self.budgets: dict[str, dict[str, int]] = {}
+        self.paused_until = 0.0
+        self.next_slot: dict[str, float] = {}
+        self._lock = Lock()
+
+    def backoff(self, attempt: int) -> float:
+        # Exponential backoff with "equal jitter": half fixed, half random
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def wait(self, resource: str) -> None:
+        with self._lock:
+            now = time.time()
+            delay = max(0.0, self.paused_until - now)
+            budget = self.budgets.get(resource)
+            if budget is not None and budget['reset'] > now:
+                if budget['remaining'] <= 0:
+                    delay = max(delay, budget['reset'] - now + 1)
+                elif budget['remaining'] < self.reserve:
+                    # Each request reserves the slot after the previous one, parallel workers don't fire together
+                    slot = max(now, self.next_slot.get(resource, now)) + (budget['reset'] - now) / budget['remaining']
+                    self.next_slot[resource] = slot
+                    delay = max(delay, slot - now)
+                budget['remaining'] -= 1
+
+        if delay > 0:
+            debugLog(self.wait, f'Waiting {delay:.1f}s for the {resource} rate limit', self.debug, 'WARNING')
+            time.sleep(delay)
+
+    def update(self, response: requests.Response, resource: str) -> None:
+        headers = response.headers
+        if 'X-RateLimit-Remaining' not in headers:
+            return
+        resource = headers.get('X-RateLimit-Resource', resource)
+        with self._lock:
+            self.budgets[resource] = {
+                'remaining': int(headers['X-RateLimit-Remaining']),
+                'reset': int(headers.get('X-RateLimit-Reset', 0))
+            }
+
+    def retry_delay(self, response: requests.Response, attempt: int) -> float | None:
+        status = response.status_code
+        if status in RETRY_STATUSES:
+            return self.backoff(attempt)
+        if status not in (403, 429):
+            return None
+
+        retry_after = retry_after_seconds(response.headers.get('Retry-After', ''))
+        if retry_after is not None:
+            delay = retry_after
+        elif response.headers.get('X-RateLimit-Remaining') == '0':
+            delay = int(response.headers.get('X-RateLimit-Reset', 0)) - time.time() + 1
+        elif status == 429 or 'secondary rate limit' in response.text.lower():
+            delay = max(SECONDARY_LIMIT_WAIT, self.backoff(attempt))
+        else:
+            return None  # Plain permission error, retrying won't help
+
+        # Rate limits apply to the whole token, hold every request back
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.time() + delay)
+        return max(0.0, delay)
+
+    def request(self, send: Callable[[], requests.Response], resource: str = 'core') -> requests.Response:
+        attempt = 0
+        while True:
+            self.wait(resource)
+            try:
+                response = send()
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff(attempt)
+                debugLog(self.request, f'{error.__class__.__name__}, retrying in {delay:.1f}s', self.debug, 'WARNING')
+            else:
+                self.update(response, resource)
+                delay = self.retry_delay(response, attempt)
+                if delay is None or attempt >= self.max_retries:
+                    return response
+                debugLog(self.request, f'HTTP {response.status_code} from {response.url}, retrying in {delay:.1f}s', self.debug, 'WARNING')
+
+            time.sleep(delay)
+            attempt += 1
+
+
+_schedulers: dict[str, RequestScheduler] = {}
+_schedulers_lock = Lock()
+
+def scheduler_for(token: str, **kwargs) -> RequestScheduler:
+    # GitHub budgets belong to the token, so every client using it shares one scheduler
+    with _schedulers_lock:
+        if token not in _schedulers:
+            _schedulers[token] = RequestScheduler(**kwargs)
+        return _schedulers[token]
\ No newline at end of file
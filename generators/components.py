@@ -1,7 +1,8 @@
+import zlib
 from math import log
 from typing import Literal
 
-from generators.config import get_color_map
+from generators.config import PARTICLES_KEYFRAMES, PARTICLES_MAX, get_color_map
 from utils.helpers.debug import debugLog
 from utils.meths import exponential_decay_formula
 
@@ -35,9 +36,10 @@ def generate_language_bar_and_defs(langs_info: tuple[dict[str, Number], int], ca
 
     segments.append(f'<rect x="{x_offset}" y="0" width="{other_languages}%" height="8" fill="{color_map.get('Others', '#858585')}"/>')
     
-    clip_id = f"rounded-bar-{id(top_langs)}"
-    
     bar = f''.join(segments)
+    # Derived from the bar itself so identical inputs render byte-identical cards
+    clip_id = f"rounded-bar-{zlib.crc32(bar.encode()):08x}"
+
     bar_block = [f'<g clip-path="url(#{clip_id})">', f'{bar}', '</g>']
     bar_block = f''.join(bar_block)
     
@@ -249,7 +251,7 @@ def generate_flame(active_streak: int, debug: bool = False) -> tuple[str, str, s
 
     return flame_gradient, flame_fill, flame_number_color, flame_y
 
-def generate_animated_blobs_and_style(langs_info: tuple[dict[str, Number], int], svg_dimensions: tuple[Number, Number] = (500, 800), margins: tuple[Number, Number] = (10, 10), debug: bool = False) -> tuple[str, str]:
+def generate_animated_blobs_and_style(langs_info: tuple[dict[str, Number], int], svg_dimensions: tuple[Number, Number] = (500, 800), margins: tuple[Number, Number] = (10, 10), max_particles: int = PARTICLES_MAX, keyframes_pool: int = PARTICLES_KEYFRAMES, debug: bool = False) -> tuple[str, str]:
     # WILL REDO TO WORK IN PERCENTAGES
     
     langs, max_langs = langs_info
@@ -260,16 +262,29 @@ def generate_animated_blobs_and_style(langs_info: tuple[dict[str, Number], int],
 
     top_langs = list(langs.items())[:max_langs-1]
         
-    # Calculate total number of blobs (let's use 100 total)
-    total_blobs = width*height/1000
+    # Density grows with the card area but is capped, so bigger cards don't mean bigger files
+    total_blobs = min(width*height/1000, max_particles)
     blobs = ['<g opacity="0.8" filter="url(#blur)">']
     
-    animations = []
-    
     import random
     random.seed(42)  # For consistency
     
-    dot_id = 0
+    # A small pool of movement paths shared by every particle
+    animations = ['.particle { animation-timing-function: ease-in-out; animation-iteration-count: infinite; }']
+    for anim_id in range(keyframes_pool):
+        dx1 = random.uniform(-50, 50)
+        dy1 = random.uniform(-50, 50)
+        dx2 = random.uniform(-30, 30)
+        dy2 = random.uniform(-30, 30)
+        animations.append(
+            f'@keyframes float{anim_id} {{ '
+            f'0%, 100% {{ transform: translate(0, 0); opacity: 0.4; }} '
+            f'25% {{ transform: translate({dx1:.1f}px, {dy1:.1f}px); opacity: 0.8; }} '
+            f'50% {{ transform: translate({dx2:.1f}px, {dy2:.1f}px); opacity: 0.6; }} '
+            f'75% {{ transform: translate({-dx1:.1f}px, {-dy1:.1f}px); opacity: 0.9; }} }}'
+        )
+    
+    directions = ('normal', 'reverse', 'alternate', 'alternate-reverse')
     for lang, percent in top_langs:
         color = color_map.get(lang, '#858585')
         # Calculate number of blobs for this language
@@ -281,28 +296,15 @@ def generate_animated_blobs_and_style(langs_info: tuple[dict[str, Number], int],
             y = random.uniform(10, height - margin_y)
             # Random size
             size = random.uniform(3, 10)
-            # Random animation parameters
+            # Each particle varies a shared path by its phase, speed and direction
+            anim_name = f'float{random.randrange(keyframes_pool)}'
             duration = random.uniform(15, 40)
             delay = random.uniform(0, 20)
+            direction = random.choice(directions)
             
-            # Random movement path
-            dx1 = random.uniform(-50, 50)
-            dy1 = random.uniform(-50, 50)
-            dx2 = random.uniform(-30, 30)
-            dy2 = random.uniform(-30, 30)
-            
-            # Create keyframe animation
-            anim_name = f"float{dot_id}"
-            animations.append(f"""
-                @keyframes {anim_name} {{
-                    0%, 100% {{ transform: translate(0, 0); opacity: 0.4; }}
-                    25% {{ transform: translate({dx1}px, {dy1}px); opacity: 0.8; }}
-                    50% {{ transform: translate({dx2}px, {dy2}px); opacity: 0.6; }}
-                    75% {{ transform: translate({-dx1}px, {-dy1}px); opacity: 0.9; }}
-                }}
-            """)
-            
-            blobs.append(f'''<circle cx="{x}" cy="{y}" r="{size}" fill="{color}" style="animation: {anim_name} {duration}s ease-in-out {delay}s infinite;"/>''')
-            dot_id += 1
+            blobs.append(
+                f'<circle class="particle" cx="{x:.1f}" cy="{y:.1f}" r="{size:.1f}" fill="{color}" '
+                f'style="animation-name: {anim_name}; animation-duration: {duration:.1f}s; animation-delay: -{delay:.1f}s; animation-direction: {direction};"/>'
+            )
     blobs.append('</g>')
-    return f''.join(blobs), f''.join(animations)
\ No newline at end of file
+    return f''.join(blobs), f' '.join(animations)
\ No newline at end of file
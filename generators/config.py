@@ -2,6 +2,11 @@ from typing import TypeAlias
 
 HexColor: TypeAlias = str
 
+# Particle layer budget: at most PARTICLES_MAX circles per card, all sharing
+# PARTICLES_KEYFRAMES @keyframes, so the file size doesn't grow with the card
+PARTICLES_MAX = 150
+PARTICLES_KEYFRAMES = 8
+
 def get_color_map() -> tuple[str, HexColor]:
     return {
         'Python': "#ffd700",
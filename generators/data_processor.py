@@ -1,12 +1,41 @@
+import hashlib
+import json
 from datetime import date
+from types import MappingProxyType
 
-from models.github_data import Repository
+from models.github_data import Profile, Repository
 from stats import contributions, languages, stars, streaks, views
+from stats.traffic_store import TRAFFIC_DB, TrafficStore
 from utils.customDataTypes import ProcessedData, TotalGitHubData
-from utils.tools import format_date, unwrap_data
+from utils.datastore import datastore_for
+from utils.tools import unwrap_data
 from utils.helpers.debug import debugLog
 
 
+def fingerprint(processed: dict) -> str:
+    # Everything the cards are drawn from; the records are already summarised in the other keys
+    inputs = {key: value for key, value in processed.items() if key not in ('profile', 'full_repos')}
+    # The datastore returns every profile column, missing ones as None; the files only keep what GitHub sent
+    inputs['full_profile'] = {key: value for key, value in processed['full_profile'].items() if value is not None}
+    canonical = json.dumps(inputs, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def freeze(processed: dict) -> ProcessedData:
+    return MappingProxyType({
+        key: MappingProxyType(value) if isinstance(value, dict) else value
+        for key, value in processed.items()
+    })
+
+
+def thaw(processed: ProcessedData) -> dict:
+    # Mapping proxies cannot be pickled, plain dicts can cross into worker processes
+    return {
+        key: dict(value) if isinstance(value, MappingProxyType) else value
+        for key, value in processed.items()
+    }
+
+
 def process_github_data(github_data: TotalGitHubData, config: dict, debug: bool = False) -> ProcessedData:
     debugLog(process_github_data, 'Starting process_github_data', debug, 'DEBUG')
     
@@ -18,36 +47,54 @@ def process_github_data(github_data: TotalGitHubData, config: dict, debug: bool
     )
     debugLog(process_github_data, f'Unwrapped data for user {user_data.get("login")}', debug, 'DEBUG')
 
-    repos: dict[str, Repository] = {
-        name: Repository(raw_repo_data) for name, raw_repo_data in repositories_data.items()
-    }
+    # Built once per run, every card and stat reads the same records
+    profile = Profile.from_dict(user_data)
+    repos: dict[str, Repository] = Repository.from_page(repositories_data.values())
     
-    stars_total = stars.get_total(repos, debug)
-    debugLog(process_github_data, f'Total stars: {stars_total}', debug, 'DEBUG')
+    store = datastore_for(config, debug)
+    if store is not None:
+        # Summed in SQL over the datastore rows instead of walking every repository and year
+        user = user_data['login']
+        stars_total = store.stars_total(user)
+        contributions_this_year = store.contributions(user, date.today().year)
+        contributions_total = store.contributions(user)
+        languages_data = languages.percentages(store.language_bytes(user), config['EXCLUDED_LANGUAGES'])
+        store.close()
+    else:
+        stars_total = stars.get_total(repos, debug)
 
-    # Contributions -> Might update when changed to fetch contribs per repository
-    #contributions_this_year = contributions.get_year(repos, date.today().year, debug)
-    #contributions_total = contributions.get_total(repos, debug)
-    elements = ['total', 'commits', 'prs', 'issues']
-    contributions_this_year = {
-        element: contributions.get_year(element, contributions_total, date.today().year, debug)
-        for element in elements
-    }
-    contributions_total = {
-        element: contributions.get_total(element, contributions_total, debug)
-        for element in elements
-    }
-    debugLog(process_github_data, f'Processed contributions for elements: {elements}', debug, 'DEBUG')
+        # Contributions -> Might update when changed to fetch contribs per repository
+        #contributions_this_year = contributions.get_year(repos, date.today().year, debug)
+        #contributions_total = contributions.get_total(repos, debug)
+        elements = ['total', 'commits', 'prs', 'issues']
+        contributions_this_year = {
+            element: contributions.get_year(element, contributions_total, date.today().year, debug)
+            for element in elements
+        }
+        contributions_total = {
+            element: contributions.get_total(element, contributions_total, debug)
+            for element in elements
+        }
+        debugLog(process_github_data, f'Processed contributions for elements: {elements}', debug, 'DEBUG')
+        languages_data = languages.get_percentages(repos, config['EXCLUDED_LANGUAGES'], debug)
+    debugLog(process_github_data, f'Total stars: {stars_total}', debug, 'DEBUG')
 
     # Streaks
-    active_streak = streaks.get_active(contributions_day, date.today(), debug)
-    longest_streak = streaks.get_longest(contributions_day, debug)
+    # Picks up from the stored streak state, only the days since it was saved are scanned
+    _, streak_info = streaks.update_state(github_data.get('streak_state'), contributions_day, date.today(), debug)
+    active_streak = {**streak_info['active'], 'pretty': streaks.get_range(streak_info['active'])}
+    longest_streak = {**streak_info['longest'], 'pretty': streaks.get_range(streak_info['longest'], '0 Bitches??')}
 
-    repo_views = views.get_views(repos, debug)
-    
-    languages_data = languages.get_percentages(repos, config['EXCLUDED_LANGUAGES'], debug)
+    traffic = TrafficStore(config.get('TRAFFIC_DB', TRAFFIC_DB), debug)
+    traffic.import_legacy(user_data['login'])
+    repo_views = views.get_views(repos, debug, traffic)
+    traffic.close()
+
+    # Downloaded once per run (and revalidated against the on-disk copy), not once per card
+    avatar = profile.avatar(config.get('AVATAR_SIZE', 140))
         
-    return {
+    # Read-only snapshot, shared by every card model rendered in this run
+    processed = {
         'stars_total': stars_total,
         'contributions_t': contributions_total,
         'contributions_y': contributions_this_year,
@@ -55,10 +102,15 @@ def process_github_data(github_data: TotalGitHubData, config: dict, debug: bool
         'longest_streak': longest_streak,
         'repos_views': repo_views,
         'languages': languages_data,
+        'avatar': avatar,
         'full_profile': user_data,
+        'profile': profile,
         'full_repos': repos
-
     }
+    processed['fingerprint'] = fingerprint(processed)
+    debugLog(process_github_data, f'Input fingerprint: {processed["fingerprint"]}', debug, 'DEBUG')
+
+    return freeze(processed)
     # return {
     #     'username': user_data['login'],
     #     'user_name': user_data['name'],
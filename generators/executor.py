@@ -0,0 +1,44 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from generators.data_processor import freeze, thaw
+from generators.minifier import minify_svg
+from generators.models.svg_generator import generate_svg
+from utils.customDataTypes import ProcessedData
+from utils.helpers.debug import debugLog
+
+# (snapshot index, model name, minify, precision)
+RenderJob = tuple[int, str, bool, int]
+
+# Set once per worker process by the pool initializer, never per job
+_snapshots: list[ProcessedData] = []
+
+
+def _init_worker(snapshots: list[dict]) -> None:
+    global _snapshots
+    _snapshots = [freeze(snapshot) for snapshot in snapshots]
+
+
+def _render(job: RenderJob) -> str:
+    slot, model, minify, precision = job
+    svg_code = generate_svg(_snapshots[slot], model)
+    return minify_svg(svg_code, precision) if minify else svg_code
+
+
+def render_jobs(snapshots: list[ProcessedData], jobs: list[RenderJob], workers: int | None = None, debug: bool = False) -> list[str]:
+    """Render independent (snapshot, model) jobs and return the SVGs in job order."""
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    debugLog(render_jobs, f'Rendering {len(jobs)} cards on {workers} workers', debug, 'DEBUG')
+
+    # Not worth a pool: render in-process against the snapshots as they are
+    if workers <= 1:
+        _init_worker([thaw(snapshot) for snapshot in snapshots])
+        return [_render(job) for job in jobs]
+
+    # Snapshots travel once per worker (inherited on fork, pickled once on spawn), jobs are just indices
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=([thaw(snapshot) for snapshot in snapshots],)
+    ) as executor:
+        return list(executor.map(_render, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
@@ -0,0 +1,118 @@
+import gzip
+import re
+
+from utils.helpers.debug import debugLog
+
+_COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+_TOKEN = re.compile(r'(<style\b[^>]*>.*?</style>|<[^>]+>)', re.DOTALL)
+_ATTRIBUTE = re.compile(r'([\w:-]+)="([^"]*)"')
+_WHITESPACE = re.compile(r'\s+')
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,])\s*|:\s+')
+_DEFINITION = re.compile(r'<(filter|clipPath|linearGradient|radialGradient|mask|pattern)\b[^>]*>.*?</\1>', re.DOTALL)
+_EMPTY_DEFS = re.compile(r'<defs>\s*</defs>')
+_TEXT_OPEN = re.compile(r'<text\b')
+_TEXT_CLOSE = re.compile(r'</text\s*>')
+
+# Attribute values kept verbatim: links, ids and embedded data
+_VERBATIM_ATTRIBUTES = {'href', 'xlink:href', 'id', 'class'}
+
+
+def _round_numbers(text: str, precision: int) -> str:
+    pattern = re.compile(rf'-?\d+\.\d{{{precision + 1},}}')
+
+    def shorten(match: re.Match) -> str:
+        value = f'{float(match.group()):.{precision}f}'.rstrip('0').rstrip('.')
+        return '0' if value in ('-0', '') else value
+
+    return pattern.sub(shorten, text)
+
+
+def _minify_css(css: str, precision: int) -> str:
+    css = _WHITESPACE.sub(' ', css).strip()
+    css = _CSS_PUNCTUATION.sub(lambda match: match.group(1) or ':', css)
+    return _round_numbers(css, precision)
+
+
+def _minify_tag(tag: str, precision: int) -> str:
+    def attribute(match: re.Match) -> str:
+        name, value = match.groups()
+        if name in _VERBATIM_ATTRIBUTES:
+            return match.group()
+        value = _WHITESPACE.sub(' ', value).strip()
+        if name == 'style':
+            return f'{name}="{_minify_css(value, precision)}"'
+        return f'{name}="{_round_numbers(value, precision)}"'
+
+    tag = _ATTRIBUTE.sub(attribute, tag)
+    tag = _WHITESPACE.sub(' ', tag)
+    return tag.replace(' />', '/>').replace(' >', '>')
+
+
+def _dedupe_definitions(svg: str) -> str:
+    # Identical <defs> entries (same id, same content) only need to be declared once
+    seen = set()
+
+    def keep_first(match: re.Match) -> str:
+        definition = match.group()
+        if definition in seen:
+            return ''
+        seen.add(definition)
+        return definition
+
+    svg = _DEFINITION.sub(keep_first, svg)
+    return _EMPTY_DEFS.sub('', svg)
+
+
+def minify_svg(svg: str, precision: int = 2, debug: bool = False) -> str:
+    """Collapse whitespace, drop comments, round coordinates to `precision`
+    decimals and remove repeated definitions. Text keeps its words; whitespace
+    inside <text> collapses to single spaces between inline elements."""
+    original_size = len(svg)
+    svg = _COMMENT.sub('', svg)
+
+    parts = []
+    text_depth = 0
+    tokens = _TOKEN.split(svg)
+    for index, token in enumerate(tokens):
+        if index % 2:
+            if token.startswith('<style'):
+                opening, css = token.split('>', 1)
+                css, closing = css.rsplit('</', 1)
+                parts.append(f'{_minify_tag(opening + ">", precision)}{_minify_css(css, precision)}</{closing}')
+            else:
+                parts.append(_minify_tag(token, precision))
+                if _TEXT_OPEN.match(token) and not token.endswith('/>'): text_depth += 1
+                elif _TEXT_CLOSE.match(token): text_depth = max(0, text_depth - 1)
+        elif token.strip() or (
+            token and text_depth and not _TEXT_OPEN.match(tokens[index - 1])
+            and index + 1 < len(tokens) and not _TEXT_CLOSE.match(tokens[index + 1])
+        ):
+            # Between two <tspan>s the space is part of the rendered text
+            parts.append(_WHITESPACE.sub(' ', token))
+
+    svg = _dedupe_definitions(''.join(parts))
+    debugLog(minify_svg, f'Minified SVG from {original_size} to {len(svg)} characters', debug, 'DEBUG')
+    return svg
+
+
+def precompress(filename: str, content: str, formats: list[str], debug: bool = False) -> list[tuple[str, bytes]]:
+    """Compressed siblings of `filename`: 'gzip' -> .svgz, 'br' -> .svg.br (needs brotli)."""
+    data = content.encode('utf-8')
+    outputs = []
+    for compression in formats:
+        if compression == 'gzip':
+            path, compressed = f'{filename[:-len(".svg")]}.svgz', gzip.compress(data, 9, mtime=0)
+        elif compression == 'br':
+            try:
+                import brotli
+            except ImportError:
+                debugLog(precompress, 'brotli is not installed, skipping .br output', debug, 'WARNING')
+                continue
+            path, compressed = f'{filename}.br', brotli.compress(data)
+        else:
+            debugLog(precompress, f'Unknown compression format: {compression}', debug, 'WARNING')
+            continue
+
+        outputs.append((path, compressed))
+        debugLog(precompress, f'Compressed {path} ({len(compressed)} bytes)', debug, 'DEBUG')
+    return outputs
@@ -1,5 +1,5 @@
-from string import Template
-from typing import Any, Dict
+import random
+from typing import Any, Callable, Dict, Mapping
 
 from generators.components import (
     generate_animated_blobs_and_style,
@@ -10,27 +10,15 @@ from generators.components import (
     generate_top_repos,
 )
 from generators.models.background_generator import Background
-from models.github_data import Profile, Repository
+from generators.models.template_registry import get_template
+from models.github_data import Profile
 from utils.helpers.debug import debugLog
 from utils.tools import format_date, unwrap_data
 
 
 def load_template(model_name: str, debug: bool = False) -> str:
     debugLog(load_template, f'Loading template for model: {model_name}', debug, 'DEBUG')
-
-    templates = {
-        'default': open('generators/models/svg/templates/default.xml', 'r', encoding='utf-8').read(),
-        'neutral': open('generators/models/svg/templates/neutral.xml', 'r', encoding='utf-8').read(),
-        'oss': open('generators/models/svg/templates/oss.xml', 'r', encoding='utf-8').read(),
-        'profesional': open('generators/models/svg/templates/profesional.xml', 'r', encoding='utf-8').read(),
-        'backend': open('generators/models/svg/templates/backend.xml', 'r', encoding='utf-8').read(),
-    }
-
-    if model_name not in templates:
-        raise ValueError(f"Unknown model: {model_name}. Available: {list(templates.keys())}")
-
-    debugLog(load_template, f'Template loaded for model: {model_name}', debug, 'DEBUG')
-    return templates[model_name]
+    return get_template(model_name, debug).template.template
 
 
 def load_styles(model_card: str, debug: bool = False) -> str:
@@ -54,145 +42,147 @@ def load_styles(model_card: str, debug: bool = False) -> str:
         .repo-name { font-size: 13px; }'''
 
 
+# Static layout of every model; everything drawn from the data is a component below
+MODEL_SPECS: dict[str, dict[str, Any]] = {
+    'default': {
+        'SVG_WIDTH': 500,
+        'SVG_HEIGHT': 800,
+        'max_langs': 6,
+        'card_langs_WIDTH': 470,
+        'card_langs_HEIGHT': 180,
+        'card_streaks_WIDTH': 470,
+        'card_streaks_HEIGHT': 140,
+        # 'card_element_WIDTH': ,
+        # 'card_element_HEIGHT': ,
+        'card_margin': 30,
+        'card_width': 840,
+        'main_stats_y': 20,
+        'streak_y': 280,
+        'repos_y': 440,
+        'languages_y': 640,
+        'total_center_x': 150,
+        'current_center_x': 420,
+        'longest_center_x': 690,
+        'divider1_x': 280,
+        'divider2_x': 560,
+        'styles': 'default'
+    },
+    'neutral': {
+        'SVG_WIDTH': 550,
+        'SVG_HEIGHT': 380,
+        'max_langs': 6,
+        'card_langs_WIDTH': 510,
+        'card_langs_HEIGHT': 8,
+        'card_streaks_WIDTH': 0,
+        'card_streaks_HEIGHT': 0,
+        'styles': 'neutral'
+    },
+    'oss': {
+        'SVG_WIDTH': 900,
+        'SVG_HEIGHT': 550,
+        'max_langs': 6,
+        'card_langs_WIDTH': 420,
+        'card_langs_HEIGHT': 120,
+        'card_streaks_WIDTH': 420,
+        'card_streaks_HEIGHT': 330,
+        'styles': 'oss'
+    },
+    'profesional': {
+        'SVG_WIDTH': 700,
+        'SVG_HEIGHT': 300,
+        'max_langs': 6,
+        'card_langs_WIDTH': 410,
+        'card_langs_HEIGHT': 8,
+        'card_streaks_WIDTH': 0,
+        'card_streaks_HEIGHT': 0,
+        'styles': 'professional'
+    },
+    'backend': {
+        'SVG_WIDTH': 900,
+        'SVG_HEIGHT': 600,
+        'max_langs': 6,
+        'card_langs_WIDTH': 1,
+        'card_langs_HEIGHT': 8,
+        'card_streaks_WIDTH': 1,
+        'card_streaks_HEIGHT': 1,
+        'styles': 'backend'
+    }
+}
+
+ComponentBuilder = Callable[[dict[str, Any], Mapping[str, Any], bool], tuple]
+
+def _languages_info(spec: dict[str, Any], data: Mapping[str, Any]) -> tuple[dict[str, float], int]:
+    return data.get('languages', {}), spec['max_langs']
+
+def _svg_dimensions(spec: dict[str, Any]) -> tuple[int, int]:
+    return spec['SVG_WIDTH'], spec['SVG_HEIGHT']
+
+def _card_langs_dimensions(spec: dict[str, Any]) -> tuple[int, int]:
+    return spec['card_langs_WIDTH'], spec['card_langs_HEIGHT']
+
+def _backend_lines(spec: dict[str, Any], data: Mapping[str, Any], debug: bool = False) -> tuple[str, str, str, str]:
+    username = data['profile'].login
+    streak_time = 'days' if data['active_streak'].get('total_streak') > 0 else 'hours'
+    return (
+        f'{username}@backend:~/github-stats$',
+        f'$ git log --author="{username}" --pretty=format:"%h %s" --stat',
+        f'● ACTIVITY | Streak: {data['longest_streak'].get('total_streak')} days | Last commit: few {streak_time} ago',
+        f'{username}@backend:~/stats'
+    )
+
+# Placeholders each component fills, built only when the selected template references one of them
+COMPONENT_BUILDERS: dict[tuple[str, ...], ComponentBuilder] = {
+    ('SVG_STYLES',): lambda spec, data, debug: (load_styles(spec['styles'], debug),),
+    ('avatar_url',): lambda spec, data, debug: (data['avatar'] if 'avatar' in data else data['profile'].avatar(),),
+    ('background',): lambda spec, data, debug: (Background(_languages_info(spec, data), _svg_dimensions(spec)).apple(),),
+    ('animated_blobs', 'animated_blobs_style'): lambda spec, data, debug: generate_animated_blobs_and_style(
+        _languages_info(spec, data), _svg_dimensions(spec), debug=debug
+    ),
+    ('language_bar', 'language_bar_defs'): lambda spec, data, debug: generate_language_bar_and_defs(
+        _languages_info(spec, data), _card_langs_dimensions(spec), debug
+    ),
+    ('language_labels',): lambda spec, data, debug: (generate_language_labels(_languages_info(spec, data), _card_langs_dimensions(spec)),),
+    ('top_repos',): lambda spec, data, debug: (generate_top_repos(
+        (data.get('repos_views', {}), spec['max_langs']),
+        (data['profile'].login, (400, 100)),
+        debug=debug
+    ),),
+    ('languages_stack',): lambda spec, data, debug: (generate_language_stack(_languages_info(spec, data), _svg_dimensions(spec), debug),),
+    ('flame_gradient', 'flame_fill', 'flame_number_color', 'flame_y'): lambda spec, data, debug: generate_flame(
+        data['active_streak'].get('total_streak'), debug
+    ),
+    ('special_title', 'special_subtitle', 'special_streak', 'special_endline'): _backend_lines,
+}
+
+
+def build_components(identifiers: frozenset[str], spec: dict[str, Any], data: Mapping[str, Any], debug: bool = False) -> dict[str, Any]:
+    components = {}
+    for names, builder in COMPONENT_BUILDERS.items():
+        if identifiers.isdisjoint(names):
+            continue
+        components.update(zip(names, builder(spec, data, debug)))
+        debugLog(build_components, f'Built component {names}', debug, 'DEBUG')
+    return components
+
+
 def generate_svg(data: Dict[str, Any], model_card: str, debug: bool = False) -> str:
     debugLog(generate_svg, f'Starting generate_svg for model: {model_card}', debug, 'DEBUG')
 
     # Load template
-    template_str = load_template(model_card, debug)
+    compiled = get_template(model_card, debug)
 
     # Filter the data
-    languages = data.get('languages', {})
-    top_repos = data.get('repos_views', {})
     active_streak = data.get('active_streak', {})
     longest_streak = data.get('longest_streak', {})
+    profile: Profile = data['profile']
 
-    profile = Profile(data.get('full_profile'))
-    streak_time = 'days' if active_streak.get('total_streak') > 0 else 'hours'
-    username = profile.login()
-    # Model-specific dimensions and elements
-    model_config = {
-        'default': {
-            'SVG_WIDTH': 500,
-            'SVG_HEIGHT': 800,
-            'max_langs': 6,
-            'card_langs_WIDTH': 470,
-            'card_langs_HEIGHT': 180,
-            'card_streaks_WIDTH': 470,
-            'card_streaks_HEIGHT': 140,
-            # 'card_element_WIDTH': ,
-            # 'card_element_HEIGHT': ,
-            # 'card_element_WIDTH': ,
-            # 'card_element_HEIGHT': ,
-            'card_margin': 30,
-            'card_width': 840,
-            'main_stats_y': 20,
-            'streak_y': 280,
-            'repos_y': 440,
-            'languages_y': 640,
-            'total_center_x': 150,
-            'current_center_x': 420,
-            'longest_center_x': 690,
-            'divider1_x': 280,
-            'divider2_x': 560,
-            'background': Background((languages, 6), (500, 800)).apple(),
-            'animated_blobs': '',
-            'animated_blobs_style': '',
-            'SVG_STYLES': load_styles('default')
-        },
-        'neutral': {
-            'SVG_WIDTH': 550,
-            'SVG_HEIGHT': 380,
-            'max_langs': 6,
-            'card_langs_WIDTH': 510,
-            'card_langs_HEIGHT': 8,
-            'card_streaks_WIDTH': 0,
-            'card_streaks_HEIGHT': 0,
-            # 'card_element_WIDTH': ,
-            # 'card_element_HEIGHT': ,
-            # 'card_element_WIDTH': ,
-            # 'card_element_HEIGHT': ,
-            'SVG_STYLES': load_styles('neutral')
-        },
-        'oss': {
-            'SVG_WIDTH': 900,
-            'SVG_HEIGHT': 550,
-            'max_langs': 6,
-            'card_langs_WIDTH': 420,
-            'card_langs_HEIGHT': 120,
-            'card_streaks_WIDTH': 420,
-            'card_streaks_HEIGHT': 330,
-            # 'card_element_WIDTH': ,
-            # 'card_element_HEIGHT': ,
-            # 'card_element_WIDTH': ,
-            # 'card_element_HEIGHT': ,
-            'background': '',
-            'animated_blobs': None,
-            'animated_blobs_style': None,
-            'SVG_STYLES': load_styles('oss')
-        },
-        'profesional': {
-            'SVG_WIDTH': 700,
-            'SVG_HEIGHT': 300,
-            'max_langs': 6,
-            'card_langs_WIDTH': 410,
-            'card_langs_HEIGHT': 8,
-            'card_streaks_WIDTH': 0,
-            'card_streaks_HEIGHT': 0,
-            # 'card_element_WIDTH': ,
-            # 'card_element_HEIGHT': ,
-            # 'card_element_WIDTH': ,
-            # 'card_element_HEIGHT': ,
-            'SVG_STYLES': load_styles('professional')
-        },
-        'backend': {
-            'SVG_WIDTH': 900,
-            'SVG_HEIGHT': 600,
-            'max_langs': 6,
-            'card_langs_WIDTH': 1,
-            'card_langs_HEIGHT': 8,
-            'card_streaks_WIDTH': 1,
-            'card_streaks_HEIGHT': 1,
-            # 'card_element_WIDTH': ,
-            # 'card_element_HEIGHT': ,
-            # 'card_element_WIDTH': ,
-            # 'card_element_HEIGHT': ,
-            'special_title': f'{username}@backend:~/github-stats$',
-            'special_subtitle': f'$ git log --author="{username}" --pretty=format:"%h %s" --stat',
-            'special_streak': f'● ACTIVITY | Streak: {longest_streak.get('total_streak')} days | Last commit: few {streak_time} ago',
-            'special_endline': f'{username}@backend:~/stats'
-        }
-    }
-    
-    config = model_config.get(model_card, model_config['default'])
+    spec = MODEL_SPECS.get(model_card, MODEL_SPECS['default'])
     debugLog(generate_svg, f'Model configuration loaded for {model_card}', debug, 'DEBUG')
 
-    # Define parameters in tuples
-    languages_info = (languages, config['max_langs'])
-    top_repos_info = (top_repos, config['max_langs'])
-    svg_dimensions = (config['SVG_WIDTH'], config['SVG_HEIGHT'])
-    card_langs_dimensions = (config['card_langs_WIDTH'], config['card_langs_HEIGHT'])
-    card_streaks_dimensions = (config['card_streaks_WIDTH'], config['card_streaks_HEIGHT'])
-    card_repos_dimensions = (400, 100)
-    # Easy expansion
-    # card_element_dimensions = (config['card_element_WIDTH'], config['card_element_HEIGHT'])
-    # card_element_dimensions = (config['card_element_WIDTH'], config['card_element_HEIGHT'])
-
-    # Generate components
-    animated_blobs, animated_blobs_style = generate_animated_blobs_and_style(languages_info, svg_dimensions, debug=debug)
-    language_bar, language_bar_defs = generate_language_bar_and_defs(languages_info, card_langs_dimensions, debug)
-    language_labels = generate_language_labels(languages_info, card_langs_dimensions)
-    top_repos_svg = generate_top_repos(top_repos_info, (data.get('username'), card_repos_dimensions), debug)
-    languages_stack = generate_language_stack(languages_info, svg_dimensions, debug) 
-    flame_gradient, flame_fill, flame_number_color, flame_y = generate_flame(active_streak.get('total_streak'), debug)
-    
-    config['animated_blobs'] = animated_blobs
-    config['animated_blobs_style'] = animated_blobs_style
-
     # Create processed data with all required fields
     processed = {
         'username_label': profile.label(),
-        'created': format_date(profile.created_at().split('T')[0]),
-        'avatar_url': profile.avatar_url(),
+        'created': format_date(profile.created_at.split('T')[0]),
         'stars_total': data.get('stars_total', -1),
         'commits': data['contributions_t'].get('commits', -1),
         'prs': data['contributions_t'].get('prs', -1),
@@ -207,48 +197,24 @@ def generate_svg(data: Dict[str, Any], model_card: str, debug: bool = False) ->
         'longest_to': longest_streak.get('to_date', '9/9/999'),
         'streak_title': data.get('streak_title', 'Current Streak'),
         'streak_dates': data.get('streak_dates', ''),
-        'flame_gradient': flame_gradient,
-        'flame_y': flame_y,
-        'flame_fill': flame_fill,
-        'flame_number_color': flame_number_color
     }
 
-    # Prepare template variables
+    # Backgrounds are randomised; seeding from the inputs keeps unchanged data rendering byte-identical cards
+    random.seed(f"{data.get('fingerprint', '')}:{model_card}")
+
+    # Prepare template variables, generating only the components this template uses
     template_vars = {
         **processed,
-        **config,
-        'language_bar': language_bar,
-        'language_bar_defs': language_bar_defs,
-        'language_labels': language_labels,
-        'top_repos': top_repos_svg,
-        'languages_stack': languages_stack,
-        'format_date': format_date,
-        'flame_gradient': flame_gradient
+        **spec,
+        **build_components(compiled.identifiers, spec, data, debug),
+        # Resolved by the compiled template's ${..._formatted} placeholders
+        'created_formatted': format_date(processed['created']),
+        'longest_from_formatted': format_date(processed['longest_from']),
+        'longest_to_formatted': format_date(processed['longest_to'])
     }
-    # Handle format_date calls in template
-    if processed.get('created'):
-        template_vars['created_formatted'] = format_date(processed['created'])
-    if processed.get('longest_from'):
-        template_vars['longest_from_formatted'] = format_date(processed['longest_from'])
-    if processed.get('longest_to'):
-        template_vars['longest_to_formatted'] = format_date(processed['longest_to'])
 
-    # Replace format_date() calls in template
-    template_str = template_str.replace(
-        '{format_date(processed[\'created\'])}',
-        format_date(processed['created'])
-    )
-    template_str = template_str.replace(
-        '{format_date(processed[\'longest_from\'])}',
-        format_date(processed['longest_from'])
-    )
-    template_str = template_str.replace(
-        '{format_date(processed[\'longest_to\'])}',
-        format_date(processed['longest_to'])
-    )
-    
     # Generate SVG
-    svg = Template(template_str).substitute(**template_vars)
+    svg = compiled.template.substitute(**template_vars)
     debugLog(generate_svg, f'SVG generated for model: {model_card}', debug, 'SUCCESS')
 
     return svg
@@ -258,9 +224,9 @@ def generate_svg(data: Dict[str, Any], model_card: str, debug: bool = False) ->
 if __name__ == "__main__":
     from datetime import datetime
     from generators.data_processor import process_github_data
-    from utils.tools import load_json
+    from utils.snapshot import load_stats
     
-    data = load_json('data/AlvarodOrs-stats.json')
+    data = load_stats('AlvarodOrs')
     
     sample_data = process_github_data(data) 
     
@@ -0,0 +1,54 @@
+import os
+from dataclasses import dataclass
+from string import Template
+from threading import Lock
+
+from utils.helpers.debug import debugLog
+
+TEMPLATES_DIR = 'generators/models/svg/templates'
+TEMPLATE_MODELS = ('default', 'neutral', 'oss', 'profesional', 'backend')
+
+# Python-looking placeholders written in the templates, rewritten once into plain
+# substitutions so a render is a single Template.substitute pass
+COMPILED_PLACEHOLDERS = {
+    "{format_date(processed['created'])}": '${created_formatted}',
+    "{format_date(processed['longest_from'])}": '${longest_from_formatted}',
+    "{format_date(processed['longest_to'])}": '${longest_to_formatted}',
+}
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    model_name: str
+    template: Template
+    identifiers: frozenset[str]
+    mtime: float
+
+_templates: dict[str, CompiledTemplate] = {}
+_templates_lock = Lock()
+
+
+def compile_template(model_name: str, debug: bool = False) -> CompiledTemplate:
+    path = os.path.join(TEMPLATES_DIR, f'{model_name}.xml')
+    mtime = os.path.getmtime(path)
+    with open(path, 'r', encoding='utf-8') as file:
+        source = file.read()
+
+    for placeholder, substitution in COMPILED_PLACEHOLDERS.items():
+        source = source.replace(placeholder, substitution)
+
+    template = Template(source)
+    debugLog(compile_template, f'Compiled template for model: {model_name}', debug, 'DEBUG')
+    return CompiledTemplate(model_name, template, frozenset(template.get_identifiers()), mtime)
+
+
+def get_template(model_name: str, debug: bool = False) -> CompiledTemplate:
+    """Return the compiled template, loaded once per process and reloaded when its file changes."""
+    if model_name not in TEMPLATE_MODELS:
+        raise ValueError(f"Unknown model: {model_name}. Available: {list(TEMPLATE_MODELS)}")
+
+    mtime = os.path.getmtime(os.path.join(TEMPLATES_DIR, f'{model_name}.xml'))
+    with _templates_lock:
+        compiled = _templates.get(model_name)
+        if compiled is None or compiled.mtime != mtime:
+            compiled = _templates[model_name] = compile_template(model_name, debug)
+    return compiled
\ No newline at end of file
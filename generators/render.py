@@ -1,36 +1,112 @@
+import hashlib
+import json
 import os
 from typing import Any
 
 from generators.data_processor import process_github_data
+from generators.executor import render_jobs
+from generators.minifier import precompress
 from generators.models.svg_generator import generate_svg
-from utils.customDataTypes import GitHubData
+from generators.models.template_registry import get_template
+from utils.atomic_io import ArtifactBatch
+from utils.customDataTypes import GitHubData, ProcessedData
 from utils.helpers.debug import debugLog
 
-def set_model(data: GitHubData, card_indx: int, config: dict, debug: bool = False):
-    debugLog(set_model, f'Starting set_model with card_indx={card_indx}', debug, 'DEBUG')
+MODELS_NAME: list[str] = ["all", "default", "neutral", "profesional", "oss", "backend"]
+# Bump when the generators change what an unchanged input renders to
+RENDER_VERSION: int = 1
 
-    # Process data
-    processed = process_github_data(data, config, debug)
-    debugLog(set_model, f'Processed data for user {processed.get("username")}', debug, 'DEBUG')
+def manifest_path(username: str) -> str:
+    return f"img/.{username}-render-manifest.json"
+
+def load_manifest(username: str) -> dict[str, dict[str, str]]:
+    try:
+        with open(manifest_path(username), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def render_key(processed: ProcessedData, card_indx: int, config: dict) -> str:
+    # Everything that decides the bytes of a card: data, template, render options and generator version
+    model = MODELS_NAME[card_indx]
+    inputs = {
+        'version': RENDER_VERSION,
+        'fingerprint': processed['fingerprint'],
+        'model': model,
+        'template': get_template(model).template.template,
+        'minify': config.get('MINIFY_SVG', True),
+        'precision': config.get('SVG_PRECISION', 2),
+        'precompress': sorted(config.get('PRECOMPRESS', []))
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+
+def file_digest(filename: str) -> str | None:
+    try:
+        with open(filename, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
 
-    models_name: list[str] = ["all", "default", "neutral", "profesional", "oss", "backend"]
+def is_unchanged(entry: dict[str, str] | None, key: str, filename: str) -> bool:
+    # The card on disk must still be the one the manifest recorded, not just the inputs
+    return bool(entry) and entry.get('inputs') == key and file_digest(filename) == entry.get('sha256')
+
+def set_model(processed: ProcessedData, card_indx: int, debug: bool = False) -> tuple[str, str, str]:
+    debugLog(set_model, f'Starting set_model with card_indx={card_indx}', debug, 'DEBUG')
 
     # Build SVG
-    svg_code = generate_svg(processed, models_name[card_indx], debug)
-    debugLog(set_model, f'Generated SVG code for model {models_name[card_indx]}', debug, 'DEBUG')
+    svg_code = generate_svg(processed, MODELS_NAME[card_indx], debug)
+    debugLog(set_model, f'Generated SVG code for model {MODELS_NAME[card_indx]}', debug, 'DEBUG')
     
-    return data['user_data']['login'].replace(' ', '_'), models_name[card_indx], svg_code
-
-def generate_stats_card(data: dict[str, Any], card_indx: int, config: dict, debug: bool = False) -> str:
-    debugLog(generate_stats_card, f'Starting generate_stats_card for card_indx={card_indx}', debug, 'DEBUG')
+    return processed['full_profile']['login'].replace(' ', '_'), MODELS_NAME[card_indx], svg_code
 
-    username, card_name, svg_code = set_model(data, card_indx, config, debug)
+def render_cards(snapshots: list[tuple[ProcessedData, dict]], card_indxs: list[int], workers: int | None = None, debug: bool = False) -> list[str]:
+    debugLog(render_cards, f'Starting render_cards for {len(snapshots)} users, card_indxs={card_indxs}', debug, 'DEBUG')
 
-    # Save file
     os.makedirs("img", exist_ok=True)
-    filename = f"img/{username}-{card_name}-stats-card.svg"
-    with open(filename, "w", encoding='utf-8') as f:
-        f.write(svg_code)
+    manifests = {}
+    jobs, pending = [], []
+    for slot, (processed, config) in enumerate(snapshots):
+        username = processed['full_profile']['login'].replace(' ', '_')
+        manifest = manifests[username] = load_manifest(username)
+        for card_indx in card_indxs:
+            filename = f"img/{username}-{MODELS_NAME[card_indx]}-stats-card.svg"
+            key = render_key(processed, card_indx, config)
+            if is_unchanged(manifest.get(filename), key, filename):
+                debugLog(render_cards, f'Inputs unchanged, skipping {filename}', debug, 'DEBUG')
+                continue
+            jobs.append((slot, MODELS_NAME[card_indx], config.get('MINIFY_SVG', True), config.get('SVG_PRECISION', 2)))
+            pending.append((username, filename, key, config))
 
-    debugLog(generate_stats_card, f'SVG file saved: {filename}', debug, 'SUCCESS')
-    return filename
\ No newline at end of file
+    if not jobs:
+        return []
+
+    # Rendering is CPU bound, writing stays in this process. Every artifact of the run is staged
+    # first and moved into place together, readers (git, serve mode) never see a partial run
+    with ArtifactBatch(debug) as artifacts:
+        for (username, filename, key, config), svg_code in zip(pending, render_jobs([processed for processed, _ in snapshots], jobs, workers, debug)):
+            artifacts.stage(filename, svg_code)
+            for path, compressed in precompress(filename, svg_code, config.get('PRECOMPRESS', []), debug):
+                artifacts.stage(path, compressed)
+            manifests[username][filename] = {'inputs': key, 'sha256': hashlib.sha256(svg_code.encode('utf-8')).hexdigest()}
+
+        for username in dict.fromkeys(entry[0] for entry in pending):
+            artifacts.stage(manifest_path(username), json.dumps(manifests[username], indent=2, sort_keys=True))
+
+    # Only files that actually changed are returned, so an unchanged run has nothing to commit
+    return artifacts.written
+
+def generate_stats_cards(data: GitHubData, card_indxs: list[int], config: dict, debug: bool = False) -> list[str]:
+    debugLog(generate_stats_cards, f'Starting generate_stats_cards for card_indxs={card_indxs}', debug, 'DEBUG')
+
+    # Process data once, every card model reads the same snapshot
+    processed = process_github_data(data, config, debug)
+    debugLog(generate_stats_cards, f'Processed data for user {processed["full_profile"].get("login")}', debug, 'DEBUG')
+
+    return render_cards([(processed, config)], card_indxs, config.get('RENDER_WORKERS'), debug)
+
+def generate_stats_card(data: dict[str, Any], card_indx: int, config: dict, debug: bool = False) -> str:
+    debugLog(generate_stats_card, f'Starting generate_stats_card for card_indx={card_indx}', debug, 'DEBUG')
+    generate_stats_cards(data, [card_indx], config, debug)
+    username = data['user_data']['login'].replace(' ', '_')
+    return f"img/{username}-{MODELS_NAME[card_indx]}-stats-card.svg"
@@ -1,28 +1,29 @@
+import sys
+
 from generators import render
+from utils.atomic_io import run_lock
 from utils.customDataTypes import GitHubData
 from utils.git_updater import auto_update_github
 from utils.helpers.debug import debugLog
 from utils.tools import load_app
-from workers import fetch_data
+from workers import batch, fetch_data
+from workers.server import CardServer
 
 
 def _card_print(card_model_indx: int, github_data: GitHubData, config: dict, debug: bool = False) -> list[str]:
     debugLog(_card_print, f'Starting _card_print with card_model_indx={card_model_indx}', debug, 'DEBUG')
 
     if card_model_indx == 0:
-        svg_files = [
-            render.generate_stats_card(github_data, card_model, config, debug)
-            for card_model in range(1, 6)
-        ]
+        svg_files = render.generate_stats_cards(github_data, list(range(1, 6)), config, debug)
         debugLog(_card_print, f'Generated {len(svg_files)} SVG files for all card models', debug, 'DEBUG')
     else:
-        svg_files = [render.generate_stats_card(github_data, card_model_indx, debug)]
+        svg_files = render.generate_stats_cards(github_data, [card_model_indx], config, debug)
         debugLog(_card_print, f'Generated SVG file for card model {card_model_indx}', debug, 'DEBUG')
 
     return svg_files
 
 
-def _commit(to_commit: bool, svg_files: list[str], debug: bool = False):
+def _commit(to_commit: bool, svg_files: list[str], config: dict | None = None, debug: bool = False):
     debugLog(_commit, f'Starting _commit with to_commit={to_commit}', debug, 'DEBUG')
 
     if not to_commit:
@@ -35,7 +36,8 @@ def _commit(to_commit: bool, svg_files: list[str], debug: bool = False):
 
         success = auto_update_github(
             file_paths=svg_files,
-            commit_message="#GitStats card update#"
+            commit_message="#GitStats card update#",
+            config=config
         )
 
         if success:
@@ -52,17 +54,51 @@ def main(card_indx: int = 0, call_api: bool = True, auto_commit: bool = True, de
     config = load_app()
     debugLog(main, 'Loaded app configuration', debug, 'DEBUG')
 
-    data = fetch_data.fetch_data(config, call_api, auto_commit, debug)
-    debugLog(main, f'Fetched GitHub data: {data}', debug, 'DEBUG')
+    # Overlapping cron runs wait for each other instead of clobbering data/ and img/
+    with run_lock(timeout=config.get('RUN_LOCK_TIMEOUT', 300), debug=debug):
+        data = fetch_data.fetch_data(config, call_api, auto_commit, debug)
+        debugLog(main, f'Fetched GitHub data: {data}', debug, 'DEBUG')
+
+        svg_file = _card_print(card_indx, data, config, debug)
+        debugLog(main, f'Generated SVG files: {svg_file}', debug, 'DEBUG')
+
+        if not svg_file:
+            debugLog(main, 'Cards unchanged, nothing to commit', debug, 'SUCCESS')
+        elif auto_commit:
+            commit_message = _commit(auto_commit, svg_file, config, debug)
+            if commit_message:
+                debugLog(main, f'Commit message: {commit_message}', debug, 'DEBUG')
+
+
+def main_batch(card_indx: int = 0, call_api: bool = True, auto_commit: bool = True, debug: bool = False):
+    debugLog(main_batch, f'Starting main_batch with card_indx={card_indx}, call_api={call_api}, auto_commit={auto_commit}', debug, 'DEBUG')
+
+    config = load_app()
+    card_indxs = list(range(1, 6)) if card_indx == 0 else [card_indx]
+
+    with run_lock(timeout=config.get('RUN_LOCK_TIMEOUT', 300), debug=debug):
+        svg_files = batch.run_batch(config, card_indxs, call_api, auto_commit, debug)
+        debugLog(main_batch, f'Generated SVG files: {svg_files}', debug, 'DEBUG')
+
+        if not svg_files:
+            debugLog(main_batch, 'Cards unchanged, nothing to commit', debug, 'SUCCESS')
+        elif auto_commit:
+            commit_message = _commit(auto_commit, svg_files, batch.committer_config(config), debug)
+            if commit_message:
+                debugLog(main_batch, f'Commit message: {commit_message}', debug, 'DEBUG')
 
-    svg_file = _card_print(card_indx, data, config, debug)
-    debugLog(main, f'Generated SVG files: {svg_file}', debug, 'DEBUG')
 
-    if auto_commit:
-        commit_message = _commit(auto_commit, svg_file, debug)
-        if commit_message:
-            debugLog(main, f'Commit message: {commit_message}', debug, 'DEBUG')
+def main_serve(call_api: bool = True, debug: bool = False):
+    debugLog(main_serve, f'Starting main_serve with call_api={call_api}', debug, 'DEBUG')
+
+    config = load_app()
+    CardServer(config, debug).serve(config.get('SERVE_HOST', '127.0.0.1'), config.get('SERVE_PORT', 8080), call_api)
 
 
 if __name__ == '__main__':
-    main(card_indx=0, call_api=True, auto_commit=True, debug=False)
\ No newline at end of file
+    if sys.argv[1:2] == ['batch']:
+        main_batch(card_indx=0, call_api=True, auto_commit=True, debug=False)
+    elif sys.argv[1:2] == ['serve']:
+        main_serve(call_api=True, debug=False)
+    else:
+        main(card_indx=0, call_api=True, auto_commit=True, debug=False)
\ No newline at end of file
@@ -1,10 +1,21 @@
+from array import array
 from datetime import datetime, timedelta, date
-from typing import TypeAlias, Any
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # optional, the array path below gives the same results
+    np = None
 
 from utils.customDataTypes import DataByDay, StreakInfoData
 from utils.helpers.debug import debugLog
 from utils.tools import format_date
 
+TOP_STREAKS = 5
+# Today's and yesterday's counts can still change (timezones, late pushes), older days are final
+STREAK_OPEN_DAYS = 2
+STREAK_STATE_VERSION = 1
+
 def get_range(streak: StreakInfoData, msg: str = 'Lost...') -> str:
     dflt = {'from_date': 0, 'to_date': 0, 'total_streak': 0}
     return msg if streak == dflt else f'{format_date(streak.get('from_date'), False)} - {format_date(streak.get('to_date'), False)}'
@@ -53,29 +64,143 @@ def get_consecutives(contributions_daily: DataByDay, debug: bool = False) -> lis
 
     return total_consecutives
 
-def get_active(contributions_daily: DataByDay, date_today, debug: bool = False) -> StreakInfoData:
-    debugLog(get_active, f'Looking for active streak until {type(date_today)}', debug, 'DEBUG')
-    default_res = {'from_date': 0, 'to_date': 0, 'total_streak': 0}
-    streaks = get_consecutives(contributions_daily, debug)
+def _empty_streak() -> StreakInfoData:
+    return {'from_date': 0, 'to_date': 0, 'total_streak': 0}
 
-    if streaks == default_res:
-        return default_res
-    
-    active_streak = [streak for streak in streaks if streak['from_date'] == date_today or streak['to_date'] == date_today]
-    result = default_res if active_streak == [] else active_streak[0] 
+def daily_counts(contributions_daily: DataByDay, today: date) -> tuple[int, array]:
+    """Dense per-day counts from the first recorded day through `today`, as (first ordinal, counts)."""
+    ordinals = {date.fromisoformat(day).toordinal(): count for day, count in contributions_daily.items()}
+    first = min(ordinals)
+    counts = array('i', [0]) * (max(max(ordinals), today.toordinal()) - first + 1)
+    for ordinal, count in ordinals.items():
+        counts[ordinal - first] = count
+    return first, counts
+
+def _runs(counts: array) -> tuple[list[int], list[int]]:
+    # (start offset, length) of every run of days with at least one contribution
+    if np is not None:
+        contributed = np.frombuffer(counts, dtype=np.int32) > 0
+        edges = np.flatnonzero(np.diff(np.concatenate(([False], contributed, [False])).astype(np.int8)))
+        starts, ends = edges[0::2], edges[1::2]
+        return starts.tolist(), (ends - starts).tolist()
+
+    starts, lengths = [], []
+    run_start = None
+    for offset, count in enumerate(counts):
+        if count > 0:
+            if run_start is None: run_start = offset
+        elif run_start is not None:
+            starts.append(run_start)
+            lengths.append(offset - run_start)
+            run_start = None
+    if run_start is not None:
+        starts.append(run_start)
+        lengths.append(len(counts) - run_start)
+    return starts, lengths
+
+def compute_streaks(contributions_daily: DataByDay, today: date | str, top_k: int = TOP_STREAKS, debug: bool = False) -> dict[str, Any]:
+    """Active, longest and the `top_k` longest streaks from a single pass over the daily counts."""
+    if isinstance(today, str): today = date.fromisoformat(today)
+    if not contributions_daily or 'total_streak' in contributions_daily:
+        return {'active': _empty_streak(), 'longest': _empty_streak(), 'top': []}
+
+    first, counts = daily_counts(contributions_daily, today)
+    starts, lengths = _runs(counts)
+    debugLog(compute_streaks, f'Found {len(starts)} streaks over {len(counts)} days', debug, 'DEBUG')
+
+    def streak(index: int) -> StreakInfoData:
+        return {
+            'from_date': date.fromordinal(first + starts[index]).isoformat(),
+            'to_date': date.fromordinal(first + starts[index] + lengths[index] - 1).isoformat(),
+            'total_streak': lengths[index]
+        }
+
+    # Longest first, earliest first among equals
+    ranked = sorted(range(len(starts)), key=lambda index: (-lengths[index], starts[index]))
+    # The counts run through today, so only the last run can still be going
+    active = streak(len(starts) - 1) if starts and starts[-1] + lengths[-1] == len(counts) else _empty_streak()
+    return {
+        'active': active,
+        'longest': streak(ranked[0]) if ranked else _empty_streak(),
+        'top': [streak(index) for index in ranked[:top_k]]
+    }
+
+def _streak(start: int, end: int) -> StreakInfoData:
+    return {'from_date': date.fromordinal(start).isoformat(), 'to_date': date.fromordinal(end).isoformat(), 'total_streak': end - start + 1}
+
+def _close(top: list[StreakInfoData], start: int, end: int, top_k: int = TOP_STREAKS) -> None:
+    top.append(_streak(start, end))
+    top.sort(key=lambda streak: (-streak['total_streak'], streak['from_date']))
+    del top[top_k:]
+
+def _walk(contributions_daily: DataByDay, run_start: int | None, top: list[StreakInfoData], first: int, last: int) -> int | None:
+    # Feeds days first..last (ordinals) into `top`, returns the run still open after `last`
+    for day in range(first, last + 1):
+        if contributions_daily.get(date.fromordinal(day).isoformat(), 0) > 0:
+            if run_start is None: run_start = day
+        elif run_start is not None:
+            _close(top, run_start, day - 1)
+            run_start = None
+    return run_start
+
+def _rebuild_state(contributions_daily: DataByDay, today: date, frozen: int) -> tuple[int | None, list[StreakInfoData]]:
+    first, counts = daily_counts(contributions_daily, today)
+    starts, lengths = _runs(counts[:max(0, frozen - first + 1)])
+    run_start = None
+    if starts and first + starts[-1] + lengths[-1] - 1 == frozen:
+        run_start = first + starts.pop()
+        lengths.pop()
+
+    ranked = sorted(range(len(starts)), key=lambda index: (-lengths[index], starts[index]))[:TOP_STREAKS]
+    return run_start, [_streak(first + starts[index], first + starts[index] + lengths[index] - 1) for index in ranked]
+
+def update_state(state: dict[str, Any] | None, contributions_daily: DataByDay, today: date | str, debug: bool = False) -> tuple[dict[str, Any] | None, dict[str, Any]]:
+    """Advance the persisted streak state to the days that are now final, in O(days since it was saved).
+
+    Returns the new state and the same result as `compute_streaks`. A missing or stale state is
+    rebuilt with a full scan; callers drop the state when past days are rewritten.
+    """
+    if isinstance(today, str): today = date.fromisoformat(today)
+    if not contributions_daily or 'total_streak' in contributions_daily:
+        return None, {'active': _empty_streak(), 'longest': _empty_streak(), 'top': []}
+
+    frozen = today.toordinal() - STREAK_OPEN_DAYS
+    through = date.fromisoformat(state['frozen_through']).toordinal() if state and state.get('version') == STREAK_STATE_VERSION else None
+    if through is not None and through <= frozen:
+        run_start = date.fromisoformat(state['run_start']).toordinal() if state['run_start'] else None
+        top = [dict(streak) for streak in state['top']]
+        run_start = _walk(contributions_daily, run_start, top, through + 1, frozen)
+        debugLog(update_state, f'Advanced streak state by {frozen - through} days', debug, 'DEBUG')
+    else:
+        run_start, top = _rebuild_state(contributions_daily, today, frozen)
+        debugLog(update_state, 'Rebuilt streak state from the full history', debug, 'DEBUG')
+
+    new_state = {
+        'version': STREAK_STATE_VERSION,
+        'frozen_through': date.fromordinal(frozen).isoformat(),
+        'run_start': date.fromordinal(run_start).isoformat() if run_start is not None else None,
+        'top': top
+    }
+
+    # The open days are applied on top without being saved, they may still change
+    top = [dict(streak) for streak in top]
+    open_start = _walk(contributions_daily, run_start, top, frozen + 1, today.toordinal())
+    active = _empty_streak()
+    if open_start is not None:
+        active = _streak(open_start, today.toordinal())
+        _close(top, open_start, today.toordinal())
+
+    return new_state, {'active': active, 'longest': dict(top[0]) if top else _empty_streak(), 'top': top}
+
+def get_active(contributions_daily: DataByDay, date_today, debug: bool = False) -> StreakInfoData:
+    debugLog(get_active, f'Looking for active streak until {date_today}', debug, 'DEBUG')
+    result = compute_streaks(contributions_daily, date_today, 0, debug)['active']
     result['pretty'] = get_range(result)
     return result
 
 def get_longest(contributions_daily: DataByDay, debug: bool = False) -> StreakInfoData:
     debugLog(get_longest, f'Looking for longest streak', debug, 'DEBUG')
-    default_res = {'from_date': 0, 'to_date': 0, 'total_streak': 0}
-    streaks = get_consecutives(contributions_daily, debug)
-
-    if streaks == default_res:
-        return default_res
-    
-    longest_streak = max(streaks, key=lambda s: s['total_streak'], default=None)
-    result = default_res if longest_streak == {} else longest_streak 
+    result = compute_streaks(contributions_daily, date.today(), 0, debug)['longest']
     result['pretty'] = get_range(result, '0 Bitches??')
     return result
 
@@ -140,4 +265,31 @@ if __name__ == "__main__":
     longest = get_longest(data, True)
 
     print(f'Active: {active}')
-    print(f'Longest: {longest}')
\ No newline at end of file
+    print(f'Longest: {longest}')
+
+    # Benchmark against the legacy grouping on a 15-year synthetic history
+    import random
+    from timeit import timeit
+
+    random.seed(0)
+    today = date.today()
+    history = {
+        str(today - timedelta(days=offset)): random.choice([0, 0, 1, 2, 5])
+        for offset in range(15 * 365)
+    }
+    legacy = max(get_consecutives(history), key=lambda s: s['total_streak'])
+    engine = compute_streaks(history, today)
+    assert (legacy['from_date'], legacy['total_streak']) == (engine['longest']['from_date'], engine['longest']['total_streak'])
+
+    for offset in (0, 1, 30, 400):
+        state, _ = update_state(None, history, today - timedelta(days=offset))
+        assert update_state(state, history, today)[1] == engine
+
+    runs = 3
+    legacy_time = timeit(lambda: (get_consecutives(history), get_consecutives(history)), number=runs) / runs
+    engine_time = timeit(lambda: compute_streaks(history, today), number=runs) / runs
+    print(f'Legacy get_active + get_longest: {legacy_time * 1000:.1f} ms')
+    print(f'compute_streaks ({"numpy" if np is not None else "array"}): {engine_time * 1000:.1f} ms ({legacy_time / engine_time:.0f}x)')
+    state, _ = update_state(None, history, today - timedelta(days=1))
+    state_time = timeit(lambda: update_state(state, history, today), number=runs) / runs
+    print(f'update_state from yesterday\'s state: {state_time * 1000:.2f} ms')
\ No newline at end of file
@@ -0,0 +1,154 @@
+import json
+import os
+import re
+import sqlite3
+from datetime import date, timedelta
+from threading import Lock
+
+from utils.helpers.debug import debugLog
+
+TRAFFIC_DB = 'data/traffic.sqlite3'
+# GitHub only reports the last 14 days, today included
+TRAFFIC_WINDOW_DAYS = 14
+# Before the store, all-time views were kept as one {repo: {"total_views": n}} file per day
+LEGACY_VIEWS_DIR = 'data/views'
+_LEGACY_VIEWS_FILE = re.compile(r'(\d{4}-\d{2}-\d{2})\.json')
+
+# (day, count, uniques) as returned in the `views` series of /traffic/views
+DailyViews = list[tuple[str, int, int]]
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS traffic_views (
+    user TEXT NOT NULL COLLATE NOCASE,
+    repo TEXT NOT NULL,
+    day TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    uniques INTEGER NOT NULL,
+    PRIMARY KEY (user, repo, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS traffic_views_user_day ON traffic_views (user, day);
+CREATE TABLE IF NOT EXISTS traffic_fetches (
+    user TEXT NOT NULL COLLATE NOCASE,
+    repo TEXT NOT NULL,
+    pushed_at TEXT,
+    window_end TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    uniques INTEGER NOT NULL,
+    PRIMARY KEY (user, repo)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS traffic_baseline (
+    user TEXT NOT NULL COLLATE NOCASE,
+    repo TEXT NOT NULL,
+    through TEXT NOT NULL,
+    views INTEGER NOT NULL,
+    PRIMARY KEY (user, repo)
+) WITHOUT ROWID;
+'''
+
+
+class TrafficStore:
+    """Date-indexed traffic history, one row per (user, repo, day) however many 14-day windows saw it."""
+
+    def __init__(self, path: str = TRAFFIC_DB, debug: bool = False):
+        self.path = path
+        self.debug = debug
+        self._lock = Lock()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(SCHEMA)
+
+    def _record(self, user: str, repo: str, daily: DailyViews) -> None:
+        # Overlapping windows land on the same key; the newest fetch of a day wins (today's count is still growing)
+        self.connection.executemany(
+            '''INSERT INTO traffic_views (user, repo, day, count, uniques) VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT (user, repo, day) DO UPDATE SET count = excluded.count, uniques = excluded.uniques''',
+            [(user, repo, day[:10], count, uniques) for day, count, uniques in daily]
+        )
+
+    def ingest(self, user: str, repo: str, views: dict, pushed_at: str | None, window_end: str) -> None:
+        """Merge a /traffic/views response and remember which window and push it was fetched for."""
+        with self._lock, self.connection:
+            self._record(user, repo, views.get('daily', []))
+            self.connection.execute(
+                '''INSERT INTO traffic_fetches (user, repo, pushed_at, window_end, count, uniques) VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (user, repo) DO UPDATE SET pushed_at = excluded.pushed_at, window_end = excluded.window_end,
+                   count = excluded.count, uniques = excluded.uniques''',
+                (user, repo, pushed_at, window_end, views.get('total_views', 0), views.get('uniques', 0))
+            )
+        debugLog(self.ingest, f'Ingested traffic for {user}/{repo} up to {window_end}', self.debug, 'DEBUG')
+
+    def import_legacy(self, user: str, directory: str = LEGACY_VIEWS_DIR) -> int:
+        """Keep the totals of the newest data/views/<day>.json as views up to that day, once per user."""
+        with self._lock:
+            if self.connection.execute('SELECT 1 FROM traffic_baseline WHERE user = ? LIMIT 1', (user,)).fetchone():
+                return 0
+        try:
+            days = sorted(match.group(1) for match in map(_LEGACY_VIEWS_FILE.fullmatch, os.listdir(directory)) if match)
+        except OSError:
+            return 0
+        if not days:
+            return 0
+
+        with open(os.path.join(directory, f'{days[-1]}.json'), 'r', encoding='utf-8') as file:
+            legacy = json.load(file)
+        # Those files covered the views before the 14-day window starting the day after, same cut here
+        rows = [(user, repo, days[-1], views.get('total_views', 0)) for repo, views in legacy.items() if views.get('total_views', 0)]
+        with self._lock, self.connection:
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO traffic_baseline (user, repo, through, views) VALUES (?, ?, ?, ?)', rows
+            )
+        debugLog(self.import_legacy, f'Imported {len(rows)} all-time view totals for {user} from {days[-1]}.json', self.debug, 'DEBUG')
+        return len(rows)
+
+    def cached_views(self, user: str, repo: str, pushed_at: str | None, window_end: str) -> dict | None:
+        """The stored views of a repo when it was already fetched for this window and push, else None."""
+        with self._lock:
+            fetched = self.connection.execute(
+                'SELECT pushed_at, window_end, count, uniques FROM traffic_fetches WHERE user = ? AND repo = ?',
+                (user, repo)
+            ).fetchone()
+            if fetched is None or fetched[0] != pushed_at or fetched[1] != window_end:
+                return None
+            window_start = str(date.fromisoformat(window_end) - timedelta(days=TRAFFIC_WINDOW_DAYS - 1))
+            daily = self.connection.execute(
+                'SELECT day, count, uniques FROM traffic_views WHERE user = ? AND repo = ? AND day >= ? ORDER BY day',
+                (user, repo, window_start)
+            ).fetchall()
+        return {'total_views': fetched[2], 'uniques': fetched[3], 'daily': [list(row) for row in daily]}
+
+    def repo_totals(self, users: list[str], since: str | None = None) -> dict[tuple[str, str], tuple[int, int]]:
+        """(views, summed daily uniques) per (lowercased user, repo) in one aggregation, all-time or from `since` (YYYY-MM-DD) on."""
+        if not users:
+            return {}
+        placeholders = ', '.join('?' * len(users))
+        with self._lock:
+            # All-time totals start from the imported baseline and only add the days after it
+            rows = self.connection.execute(
+                f'''SELECT v.user, v.repo, SUM(v.count), SUM(v.uniques) FROM traffic_views v
+                   LEFT JOIN traffic_baseline b ON b.user = v.user AND b.repo = v.repo
+                   WHERE v.user IN ({placeholders}) AND v.day >= ? AND (? IS NOT NULL OR b.through IS NULL OR v.day > b.through)
+                   GROUP BY v.user, v.repo''',
+                (*users, since or '', since)
+            ).fetchall()
+            baseline = [] if since is not None else self.connection.execute(
+                f'SELECT user, repo, views FROM traffic_baseline WHERE user IN ({placeholders})', users
+            ).fetchall()
+
+        # Logins are case-insensitive; the key must not depend on how the rows were spelled when ingested
+        totals = {(user.lower(), repo): (0, 0) for user, repo, _ in baseline}
+        totals.update({(user.lower(), repo): (views, uniques) for user, repo, views, uniques in rows})
+        for user, repo, views in baseline:
+            stored_views, uniques = totals[(user.lower(), repo)]
+            totals[(user.lower(), repo)] = (stored_views + views, uniques)
+        return totals
+
+    def totals(self, user: str, since: str | None = None) -> dict[str, tuple[int, int]]:
+        return {repo: totals for (_, repo), totals in self.repo_totals([user], since).items()}
+
+    def rolling_totals(self, user: str, days: int, today: date | None = None) -> dict[str, tuple[int, int]]:
+        return self.totals(user, str((today or date.today()) - timedelta(days=days - 1)))
+
+    def close(self) -> None:
+        self.connection.close()
@@ -1,36 +1,21 @@
-from datetime import timedelta, date
-
-from utils.customDataTypes import GitHubRepository, RepositoryViews
+from models.github_data import Repository
+from utils.customDataTypes import RepositoryViews
 from utils.helpers.debug import debugLog
-from utils.tools import load_json, write_json
+from stats.traffic_store import TRAFFIC_DB, TrafficStore
 
-def get_old_views(repos: dict[str, GitHubRepository], debug: bool = False) -> dict:
-    
-    file_path = f'data/views/{date.today() - timedelta(days=14)}.json'
-    try:
-        return load_json(file_path)
-    
-    except FileNotFoundError:
-        data = {}
-        for repo in repos.values():
-            views = {"total_views": 0}
-            data[repo.name()] = views
-        write_json(data, file_path, 4)
-        return data
+def get_views(repos: dict[str, Repository], debug: bool = False, store: TrafficStore | None = None) -> RepositoryViews:
+    # The fetcher merges every 14-day window into the store, totals come from the whole history at once
+    store = store if store is not None else TrafficStore(TRAFFIC_DB, debug)
+    owners = sorted({repo.owner for repo in repos.values()})
+    all_time = store.repo_totals(owners)
 
-def get_views(repos: dict[str, GitHubRepository], debug: bool = False) -> RepositoryViews:
     repos_views = {}
-    old_views = get_old_views(repos)
-    
     for repo in repos.values():
-        repoName = repo.name()
-        repoViews = repo.views()
-        
-        if repoName in old_views.keys():
-            _views = (old_views[repoName].get("total_views", 0), 0)
-            res = tuple(x + y for x, y in zip(repoViews, _views))
-        
-        repos_views[repoName] = {'total_views': res[0], 'uniques': res[1]}
-    
-        debugLog(get_views, f'{repoName} has {repoViews[1]} unique viewers and a total of {repoViews[0]} viewers', debug, 'DEBUG')
-    return dict(sorted(repos_views.items(), key=lambda item: item[1]['total_views'], reverse=True))
\ No newline at end of file
+        repoName = repo.name
+
+        # Repositories the store has never seen (older data) keep the window totals
+        total_views = all_time.get((repo.owner.lower(), repoName), (repo.views_total, 0))[0]
+        repos_views[repoName] = {'total_views': total_views, 'uniques': repo.views_uniques}
+
+        debugLog(get_views, f'{repoName} has {repo.views_uniques} unique viewers and a total of {total_views} viewers', debug, 'DEBUG')
+    return dict(sorted(repos_views.items(), key=lambda item: item[1]['total_views'], reverse=True))
@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import unittest
+
+from models.github_data import Repository
+from stats.traffic_store import TrafficStore
+from stats.views import get_views
+
+
+class MixedCaseUsernameTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = TrafficStore(os.path.join(self.directory.name, 'traffic.sqlite3'))
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_views_found_whatever_the_username_case(self):
+        # USERNAME written in lowercase in config.json, GitHub spells the owner AlvarodOrs
+        views = {'total_views': 5, 'uniques': 2, 'daily': [['2026-10-01', 3, 1], ['2026-10-02', 2, 1]]}
+        self.store.ingest('alvarodors', 'GitStats', views, None, '2026-10-02')
+
+        repos = Repository.from_page([{
+            'name': 'GitStats', 'full_name': 'AlvarodOrs/GitStats',
+            'views': {'total_views': 1, 'uniques': 1}
+        }])
+        self.assertEqual(get_views(repos, store=self.store)['GitStats']['total_views'], 5)
+
+    def test_repo_totals_merge_spellings(self):
+        self.store.ingest('alvarodors', 'GitStats', {'daily': [['2026-10-01', 3, 1]]}, None, '2026-10-01')
+        self.store.ingest('AlvarodOrs', 'GitStats', {'daily': [['2026-10-02', 2, 1]]}, None, '2026-10-02')
+
+        self.assertEqual(self.store.repo_totals(['ALVARODORS']), {('alvarodors', 'GitStats'): (5, 2)})
+
+
+class LegacyViewsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = TrafficStore(os.path.join(self.directory.name, 'traffic.sqlite3'))
+        self.views_dir = os.path.join(self.directory.name, 'views')
+        os.makedirs(self.views_dir)
+        for name, total in (('2026-09-01.json', 40), ('2026-09-20.json', 100), ('YYYY-MM-DDExample.json', 7)):
+            with open(os.path.join(self.views_dir, name), 'w', encoding='utf-8') as file:
+                json.dump({'GitStats': {'total_views': total}, 'Empty': {'total_views': 0}}, file)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_all_time_totals_keep_the_legacy_total(self):
+        self.assertEqual(self.store.import_legacy('AlvarodOrs', self.views_dir), 1)
+        # The day covered by the legacy file is not counted twice
+        window = {'daily': [['2026-09-20', 9, 1], ['2026-09-21', 3, 1], ['2026-09-22', 2, 1]]}
+        self.store.ingest('AlvarodOrs', 'GitStats', window, None, '2026-09-22')
+
+        self.assertEqual(self.store.repo_totals(['alvarodors'])[('alvarodors', 'GitStats')], (105, 2))
+        self.assertEqual(self.store.totals('AlvarodOrs', '2026-09-21'), {'GitStats': (5, 2)})
+
+    def test_import_runs_once_per_user(self):
+        self.store.import_legacy('AlvarodOrs', self.views_dir)
+        self.assertEqual(self.store.import_legacy('alvarodors', self.views_dir), 0)
+        self.assertEqual(self.store.repo_totals(['AlvarodOrs']), {('alvarodors', 'GitStats'): (100, 0)})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import secrets
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from utils.helpers.debug import debugLog
+
+RUN_LOCK_PATH = 'data/.gitstats.lock'
+
+
+def _stage(filepath: str, content: str | bytes) -> str:
+    # Same directory as the target so the final rename never crosses filesystems
+    directory = os.path.dirname(filepath) or '.'
+    os.makedirs(directory, exist_ok=True)
+    data = content.encode('utf-8') if isinstance(content, str) else content
+
+    # open(..., 'xb') honours the umask, mkstemp would leave every card readable by its owner only
+    tmp_path = os.path.join(directory, f'.{os.path.basename(filepath)}.{secrets.token_hex(6)}.tmp')
+    try:
+        with open(tmp_path, 'xb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+    except BaseException:
+        if os.path.exists(tmp_path): os.unlink(tmp_path)
+        raise
+    return tmp_path
+
+
+def write_atomic(filepath: str, content: str | bytes) -> None:
+    """Write `content` to a temp file, fsync it and rename it over `filepath`."""
+    os.replace(_stage(filepath, content), filepath)
+
+
+class ArtifactBatch:
+    """Stage every output of a run and move them into place together, or not at all."""
+
+    def __init__(self, debug: bool = False):
+        self.debug = debug
+        self.staged: dict[str, str] = {}
+        self.written: list[str] = []
+
+    def stage(self, filepath: str, content: str | bytes) -> str:
+        previous = self.staged.pop(filepath, None)
+        if previous: os.unlink(previous)
+        self.staged[filepath] = _stage(filepath, content)
+        return filepath
+
+    def commit(self) -> list[str]:
+        for filepath, tmp_path in self.staged.items():
+            os.replace(tmp_path, filepath)
+            self.written.append(filepath)
+        debugLog(ArtifactBatch.commit, f'Moved {len(self.staged)} artifacts into place', self.debug, 'DEBUG')
+        self.staged = {}
+        return self.written
+
+    def discard(self) -> None:
+        for tmp_path in self.staged.values():
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        self.staged = {}
+
+    def __enter__(self) -> 'ArtifactBatch':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None: self.commit()
+        else: self.discard()
+
+
+def _try_lock(file) -> bool:
+    try:
+        if fcntl: fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else: msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(file) -> None:
+    if fcntl: fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    else:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def run_lock(path: str = RUN_LOCK_PATH, timeout: float = 300, debug: bool = False) -> Iterator[None]:
+    """Hold an exclusive lock on `path` for the run; raises TimeoutError if another run keeps it past `timeout`."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a+') as file:
+        deadline = time.monotonic() + timeout
+        while not _try_lock(file):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f'Another run holds {path}')
+            debugLog(run_lock, f'Waiting for {path}', debug, 'WARNING')
+            time.sleep(1)
+
+        debugLog(run_lock, f'Acquired {path}', debug, 'DEBUG')
+        try:
+            yield
+        finally:
+            _unlock(file)
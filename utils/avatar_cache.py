@@ -0,0 +1,103 @@
+import json
+import os
+import time
+from base64 import b64encode
+from hashlib import sha1
+from io import BytesIO
+from threading import Lock
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from utils.atomic_io import write_atomic
+from utils.helpers.debug import debugLog
+
+AVATAR_CACHE_DIR = 'data/cache/avatars'
+# A long-running serve process revalidates the avatar (a 304 when unchanged) once this old
+AVATAR_MEMORY_TTL = 3600
+
+_memory: dict[tuple[str, int | None], tuple[float, str]] = {}
+_memory_lock = Lock()
+
+
+def sized_url(image_link: str, size: int | None) -> str:
+    # GitHub avatars are resized server side with the `s` query parameter
+    if size is None:
+        return image_link
+    parts = urlsplit(image_link)
+    query = dict(parse_qsl(parts.query))
+    query['s'] = str(size)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _downscale(image_bytes: bytes, mime_type: str, size: int | None) -> tuple[bytes, str]:
+    # Optional: only when Pillow is installed and the server ignored the size hint
+    if size is None:
+        return image_bytes, mime_type
+    try:
+        from PIL import Image
+    except ImportError:
+        return image_bytes, mime_type
+
+    image = Image.open(BytesIO(image_bytes))
+    if max(image.size) <= size:
+        return image_bytes, mime_type
+    image.thumbnail((size, size))
+    output = BytesIO()
+    image.save(output, format='PNG', optimize=True)
+    return output.getvalue(), 'image/png'
+
+
+def get_avatar(image_link: str, size: int | None = None, directory: str = AVATAR_CACHE_DIR, debug: bool = False, ttl: float = AVATAR_MEMORY_TTL) -> str:
+    """Return the avatar as a base64 data URI.
+
+    Held in memory for `ttl` seconds and on disk between runs; the disk copy
+    is revalidated with its ETag/Last-Modified whenever the memory entry expires.
+    """
+    key = (image_link, size)
+    with _memory_lock:
+        if key in _memory and time.monotonic() - _memory[key][0] < ttl:
+            return _memory[key][1]
+
+    from requests import RequestException
+    from api.github_client import DEFAULT_TIMEOUT, get_session
+
+    path = os.path.join(directory, f'{sha1(f"{image_link}|{size}".encode("utf-8")).hexdigest()}.json')
+    cached = None
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as file:
+            cached = json.load(file)
+
+    headers = {}
+    if cached is not None:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    try:
+        response = get_session().get(sized_url(image_link, size), headers=headers, timeout=DEFAULT_TIMEOUT)
+    except RequestException as error:
+        debugLog(get_avatar, f'Avatar download failed: {error}', debug, 'WARNING')
+        response = None
+
+    if response is not None and response.status_code == 200:
+        mime_type = response.headers.get('Content-Type', 'image/png').split(';')[0]
+        image_bytes, mime_type = _downscale(response.content, mime_type, size)
+        data_uri = f'data:{mime_type};base64,{b64encode(image_bytes).decode("utf-8")}'
+
+        write_atomic(path, json.dumps({
+            'url': image_link,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'data_uri': data_uri
+        }))
+        debugLog(get_avatar, f'Avatar downloaded ({len(data_uri)} bytes encoded)', debug, 'DEBUG')
+    elif cached is not None:
+        # 304, or GitHub unreachable: the stored copy is still the best we have
+        data_uri = cached['data_uri']
+        debugLog(get_avatar, 'Avatar served from cache', debug, 'DEBUG')
+    else:
+        return ''
+
+    with _memory_lock:
+        _memory[key] = (time.monotonic(), data_uri)
+    return data_uri
\ No newline at end of file
@@ -0,0 +1,248 @@
+import json
+import os
+import sqlite3
+from threading import Lock
+
+from utils.customDataTypes import ConfigData, TotalGitHubData
+from utils.helpers.debug import debugLog
+from utils.snapshot import PROFILE_FIELDS
+
+DATASTORE_DB = 'data/gitstats.sqlite3'
+
+# Scalar repository columns; topics, views and languages get their own columns/table
+REPO_COLUMNS = (
+    'id', 'full_name', 'private', 'fork', 'archived', 'visibility', 'html_url', 'description', 'language',
+    'default_branch', 'size', 'stargazers_count', 'watchers_count', 'forks_count', 'open_issues_count',
+    'created_at', 'updated_at', 'pushed_at'
+)
+CONTRIBUTION_ELEMENTS = ('total', 'commits', 'prs', 'issues')
+
+SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS profiles (
+    user TEXT PRIMARY KEY COLLATE NOCASE,
+    {', '.join(f'{field} {"INTEGER" if field in ("id", "public_repos", "public_gists", "followers", "following") else "TEXT"}' for field in PROFILE_FIELDS if field != 'login')},
+    streak_state TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS repos (
+    user TEXT NOT NULL COLLATE NOCASE,
+    name TEXT NOT NULL,
+    {', '.join(REPO_COLUMNS)},
+    topics TEXT,
+    views_total INTEGER NOT NULL DEFAULT 0,
+    views_uniques INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS repo_languages (
+    user TEXT NOT NULL COLLATE NOCASE,
+    repo TEXT NOT NULL,
+    language TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    PRIMARY KEY (user, repo, language)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS repo_languages_user_language ON repo_languages (user, language);
+CREATE TABLE IF NOT EXISTS contributions_yearly (
+    user TEXT NOT NULL COLLATE NOCASE,
+    year INTEGER NOT NULL,
+    {', '.join(f'{element} INTEGER NOT NULL' for element in CONTRIBUTION_ELEMENTS)},
+    PRIMARY KEY (user, year)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS contributions_daily (
+    user TEXT NOT NULL COLLATE NOCASE,
+    day TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (user, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS autocommits (
+    user TEXT NOT NULL COLLATE NOCASE,
+    day TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (user, day)
+) WITHOUT ROWID;
+'''
+
+
+def _upsert(table: str, columns: tuple[str, ...], keys: tuple[str, ...]) -> str:
+    updates = ', '.join(f'{column} = excluded.{column}' for column in columns if column not in keys)
+    changed = ' OR '.join(f'{column} IS NOT excluded.{column}' for column in columns if column not in keys)
+    # Rows that did not change are left untouched, so unchanged history costs no writes
+    return (
+        f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))}) '
+        f'ON CONFLICT ({", ".join(keys)}) DO UPDATE SET {updates} WHERE {changed}'
+    )
+
+
+class Datastore:
+    """Embedded SQLite store for everything fetched from GitHub, one row per entity instead of one JSON file per run."""
+
+    def __init__(self, path: str = DATASTORE_DB, debug: bool = False):
+        self.path = path
+        self.debug = debug
+        self._lock = Lock()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        # Readers (serve mode, offline renders) never block the writer
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    # Writes
+
+    def save_stats(self, data: TotalGitHubData, years: list[int] | None = None) -> None:
+        """Upsert a run's data; with `years`, only those years' contributions are written."""
+        profile = data['user_data']
+        user = profile['login']
+        repos = data['repositories_data']
+
+        profile_columns = ('user', *(field for field in PROFILE_FIELDS if field != 'login'), 'streak_state')
+        repo_columns = ('user', 'name', *REPO_COLUMNS, 'topics', 'views_total', 'views_uniques')
+        year_columns = ('user', 'year', *CONTRIBUTION_ELEMENTS)
+        prefixes = tuple(f'{year}-' for year in years) if years is not None else ('',)
+
+        with self._lock, self.connection:
+            self.connection.execute(
+                _upsert('profiles', profile_columns, ('user',)),
+                (user, *(profile.get(field) for field in profile_columns[1:-1]), json.dumps(data.get('streak_state')))
+            )
+
+            self.connection.executemany(_upsert('repos', repo_columns, ('user', 'name')), [
+                (
+                    user, name, *(repo.get(column) for column in REPO_COLUMNS),
+                    json.dumps(repo.get('topics')),
+                    (repo.get('views') or {}).get('total_views', 0),
+                    (repo.get('views') or {}).get('uniques', 0)
+                )
+                for name, repo in repos.items()
+            ])
+            # Repositories deleted or renamed on GitHub
+            self.connection.execute(
+                f'DELETE FROM repos WHERE user = ? AND name NOT IN ({", ".join("?" * len(repos))})', (user, *repos)
+            )
+
+            self.connection.execute('DELETE FROM repo_languages WHERE user = ?', (user,))
+            self.connection.executemany(
+                'INSERT INTO repo_languages (user, repo, language, bytes) VALUES (?, ?, ?, ?)',
+                [
+                    (user, name, language, size)
+                    for name, repo in repos.items()
+                    for language, size in (repo.get('languages') or {}).items()
+                ]
+            )
+
+            self.connection.executemany(_upsert('contributions_yearly', year_columns, ('user', 'year')), [
+                (user, int(year), *(entry.get(element, 0) for element in CONTRIBUTION_ELEMENTS))
+                for year, entry in data['data_year'].items()
+                if years is None or int(year) in years
+            ])
+            days = [day for day in data['data_day'] if day.startswith(prefixes)]
+            # Days of the re-fetched years that are no longer reported
+            for prefix in prefixes:
+                year_days = [day for day in days if day.startswith(prefix)]
+                self.connection.execute(
+                    f'DELETE FROM contributions_daily WHERE user = ? AND day LIKE ? AND day NOT IN ({", ".join("?" * len(year_days))})',
+                    (user, f'{prefix}%', *year_days)
+                )
+            self.connection.executemany(_upsert('contributions_daily', ('user', 'day', 'count'), ('user', 'day')), [
+                (user, day, data['data_day'][day]) for day in days
+            ])
+        debugLog(self.save_stats, f'Saved {len(repos)} repositories for {user}', self.debug, 'SUCCESS')
+
+    def record_autocommit(self, user: str, day: str, increment: int = 1) -> None:
+        # Same bookkeeping as utils.tools.update_json on data/<user>-auto-commits.json
+        with self._lock, self.connection:
+            self.connection.execute(
+                '''INSERT INTO autocommits (user, day, count) VALUES (?, ?, -1)
+                   ON CONFLICT (user, day) DO UPDATE SET count = count - ?''',
+                (user, day, increment)
+            )
+
+    # Reads
+
+    def load_stats(self, user: str) -> TotalGitHubData:
+        """The same shape `utils.snapshot.load_stats` returns; raises LookupError for an unknown user."""
+        profile_fields = tuple(field for field in PROFILE_FIELDS if field != 'login')
+        with self._lock:
+            profile = self.connection.execute(
+                f'SELECT user, {", ".join(profile_fields)}, streak_state FROM profiles WHERE user = ?', (user,)
+            ).fetchone()
+            if profile is None:
+                raise LookupError(f'No stored stats for {user}')
+
+            repos = self.connection.execute(
+                f'SELECT name, {", ".join(REPO_COLUMNS)}, topics, views_total, views_uniques FROM repos WHERE user = ? ORDER BY name',
+                (user,)
+            ).fetchall()
+            languages = self.connection.execute(
+                'SELECT repo, language, bytes FROM repo_languages WHERE user = ?', (user,)
+            ).fetchall()
+            years = self.connection.execute(
+                f'SELECT year, {", ".join(CONTRIBUTION_ELEMENTS)} FROM contributions_yearly WHERE user = ? ORDER BY year',
+                (user,)
+            ).fetchall()
+            days = self.connection.execute(
+                'SELECT day, count FROM contributions_daily WHERE user = ? AND count != 0 ORDER BY day', (user,)
+            ).fetchall()
+
+        repo_languages: dict[str, dict[str, int]] = {}
+        for repo, language, size in languages:
+            repo_languages.setdefault(repo, {})[language] = size
+
+        repositories = {}
+        for name, *columns, topics, views_total, views_uniques in repos:
+            repositories[name] = {
+                'name': name,
+                **dict(zip(REPO_COLUMNS, columns)),
+                'topics': json.loads(topics) if topics else None,
+                'views': {'total_views': views_total, 'uniques': views_uniques},
+                'languages': repo_languages.get(name, {})
+            }
+
+        return {
+            'user_data': {'login': profile[0], **dict(zip(profile_fields, profile[1:-1]))},
+            'repositories_data': repositories,
+            'data_year': {str(year): dict(zip(CONTRIBUTION_ELEMENTS, values)) for year, *values in years},
+            'data_day': dict(days),
+            'streak_state': json.loads(profile[-1]) if profile[-1] else None
+        }
+
+    def stars_total(self, user: str) -> int:
+        with self._lock:
+            return self.connection.execute(
+                'SELECT COALESCE(SUM(stargazers_count), 0) FROM repos WHERE user = ?', (user,)
+            ).fetchone()[0]
+
+    def language_bytes(self, user: str) -> dict[str, int]:
+        # Exact integer totals; exclusions and shares are left to stats.languages.percentages, as on the files backend
+        with self._lock:
+            rows = self.connection.execute(
+                'SELECT language, SUM(bytes) FROM repo_languages WHERE user = ? GROUP BY language', (user,)
+            ).fetchall()
+        return dict(rows)
+
+    def contributions(self, user: str, year: int | None = None) -> dict[str, int]:
+        """Contribution totals per element, across all years or for one."""
+        with self._lock:
+            row = self.connection.execute(
+                f'''SELECT {", ".join(f"COALESCE(SUM({element}), 0)" for element in CONTRIBUTION_ELEMENTS)}
+                    FROM contributions_yearly WHERE user = ? AND (? IS NULL OR year = ?)''',
+                (user, year, year)
+            ).fetchone()
+        return dict(zip(CONTRIBUTION_ELEMENTS, row))
+
+    def autocommits_by_year(self, user: str) -> dict[str, dict[str, int]]:
+        # Same totals as utils.tools.autocommits_by_year on the files backend
+        with self._lock:
+            rows = self.connection.execute(
+                'SELECT substr(day, 1, 4), -SUM(count) FROM autocommits WHERE user = ? GROUP BY 1', (user,)
+            ).fetchall()
+        return {year: {'auto-commit': count} for year, count in rows}
+
+
+def datastore_for(config: ConfigData, debug: bool = False) -> Datastore | None:
+    """The configured datastore, or None when STORAGE_BACKEND keeps the file-based stats."""
+    if config.get('STORAGE_BACKEND', 'files') != 'sqlite':
+        return None
+    return Datastore(config.get('DATASTORE_DB', DATASTORE_DB), debug)
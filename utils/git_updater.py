@@ -2,19 +2,24 @@ import subprocess
 import os
 from typing import Optional
 from datetime import datetime
-from .tools import update_json
+from .datastore import datastore_for
+from .customDataTypes import ConfigData
+from .tools import autocommits_path, load_app, update_json
 
 class GitUpdater:
     """Handles automatic Git commits and pushes"""
     
-    def __init__(self, repo_path: str = "."):
+    def __init__(self, repo_path: str = ".", config: Optional[ConfigData] = None):
         """
         Initialize Git updater
         
         Args:
             repo_path: Path to the Git repository (default: current directory)
+            config: Config of the account the auto-commits are counted for, including its
+                    STORAGE_BACKEND/DATASTORE_DB (default: config.json)
         """
         self.repo_path = repo_path
+        self.config = config
         self.repo_path_base = os.path.basename(os.path.abspath(self.repo_path))
         if self.repo_path_base != "GitStats": raise Exception(f"Careful, the processes are being run on: {os.path.abspath(self.repo_path)}")
 
@@ -182,7 +187,14 @@ class GitUpdater:
         # Push
         if not self.push(remote, branch): return False
         
-        update_json('data/auto-commits.json')
+        config = self.config if self.config is not None else load_app()
+        store = datastore_for(config)
+        username = config['USERNAME']
+        if store is not None:
+            store.record_autocommit(username, str(datetime.today().date()))
+            store.close()
+        else:
+            update_json(autocommits_path(username))
 
         return True
 
@@ -192,7 +204,8 @@ def auto_update_github(
     commit_message: str = "#GitStats card update#",
     repo_path: str = ".",
     remote: str = "origin",
-    branch: Optional[str] = None
+    branch: Optional[str] = None,
+    config: Optional[ConfigData] = None
 ) -> bool:
     """
     Convenience function to automatically commit and push changes
@@ -203,6 +216,7 @@ def auto_update_github(
         repo_path: Path to Git repository (default: current directory)
         remote: Remote name (default: 'origin')
         branch: Branch name (default: current branch)
+        config: Config of the account the auto-commit is counted for (default: config.json)
         
     Returns:
         True if successful
@@ -210,6 +224,6 @@ def auto_update_github(
     Example:
         >>> auto_update_github(['img/stats-card.svg', 'data/stats.json'])
     """
-    updater = GitUpdater(repo_path)
+    updater = GitUpdater(repo_path, config)
     
     return updater.commit_and_push(file_paths, commit_message, remote, branch)
\ No newline at end of file
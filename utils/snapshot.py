@@ -0,0 +1,158 @@
+import base64
+import json
+import sys
+import zlib
+from array import array
+from datetime import date
+from os.path import exists, getmtime
+
+try:
+    import msgpack
+except ImportError:  # optional, the zlib/JSON container is used instead
+    msgpack = None
+
+from utils.atomic_io import write_atomic
+from utils.customDataTypes import DataByDay, TotalGitHubData
+from utils.helpers.debug import debugLog
+
+SNAPSHOT_VERSION = 1
+MAGIC_MSGPACK = b'GSM1'
+MAGIC_ZJSON = b'GSZ1'
+
+# Only what stats/ and the card models read, the REST payloads carry ~40 *_url fields on top
+PROFILE_FIELDS = (
+    'login', 'id', 'name', 'avatar_url', 'html_url', 'type', 'company', 'blog', 'location', 'bio',
+    'public_repos', 'public_gists', 'followers', 'following', 'created_at', 'updated_at'
+)
+REPO_FIELDS = (
+    'id', 'name', 'full_name', 'private', 'fork', 'archived', 'visibility', 'html_url', 'description',
+    'language', 'topics', 'default_branch', 'size', 'stargazers_count', 'watchers_count', 'forks_count',
+    'open_issues_count', 'created_at', 'updated_at', 'pushed_at', 'views', 'languages'
+)
+
+
+def snapshot_path(username: str) -> str:
+    return f'data/{username}-stats.snapshot'
+
+
+def json_path(username: str) -> str:
+    return f'data/{username}-stats.json'
+
+
+def slim_stats(data: TotalGitHubData) -> TotalGitHubData:
+    return {
+        'user_data': {field: data['user_data'][field] for field in PROFILE_FIELDS if field in data['user_data']},
+        'repositories_data': {
+            name: {field: repo.get(field) for field in REPO_FIELDS}
+            for name, repo in data['repositories_data'].items()
+        },
+        'data_year': data['data_year'],
+        'data_day': data['data_day'],
+        'streak_state': data.get('streak_state')
+    }
+
+
+def pack_days(data_day: DataByDay) -> tuple[str, bytes]:
+    """Daily counts as one little-endian int32 per day, starting at the returned date."""
+    if not data_day:
+        return '', b''
+    days = sorted(data_day)
+    start = date.fromisoformat(days[0])
+    counts = array('i', [0]) * ((date.fromisoformat(days[-1]) - start).days + 1)
+    for day, count in data_day.items():
+        counts[(date.fromisoformat(day) - start).days] = count
+    if sys.byteorder == 'big': counts.byteswap()
+    return start.isoformat(), counts.tobytes()
+
+
+def unpack_days(start: str, packed: bytes) -> DataByDay:
+    if not start:
+        return {}
+    counts = array('i')
+    counts.frombytes(packed)
+    if sys.byteorder == 'big': counts.byteswap()
+    first = date.fromisoformat(start).toordinal()
+    # Fetched calendars only list days with contributions, the packed gaps are not days of their own
+    return {date.fromordinal(first + offset).isoformat(): count for offset, count in enumerate(counts) if count}
+
+
+def dump_snapshot(data: TotalGitHubData, path: str, debug: bool = False) -> None:
+    data = slim_stats(data)
+    repos = list(data['repositories_data'].values())
+    days_start, days = pack_days(data['data_day'])
+    payload = {
+        'version': SNAPSHOT_VERSION,
+        'user_data': data['user_data'],
+        # Columnar: one list per field instead of one object per repository
+        'repositories': {field: [repo[field] for repo in repos] for field in REPO_FIELDS},
+        'data_year': data['data_year'],
+        'days_start': days_start,
+        'days': days,
+        'streak_state': data['streak_state']
+    }
+
+    if msgpack is not None:
+        blob = MAGIC_MSGPACK + msgpack.packb(payload, use_bin_type=True)
+    else:
+        payload['days'] = base64.b64encode(days).decode('ascii')
+        blob = MAGIC_ZJSON + zlib.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8'), 6)
+
+    write_atomic(path, blob)
+    debugLog(dump_snapshot, f'Wrote {len(blob)} bytes to {path}', debug, 'DEBUG')
+
+
+def load_snapshot(path: str, debug: bool = False) -> TotalGitHubData:
+    with open(path, 'rb') as file:
+        blob = file.read()
+
+    magic, body = blob[:4], blob[4:]
+    if magic == MAGIC_MSGPACK:
+        if msgpack is None:
+            raise RuntimeError(f'{path} was written with msgpack, install it or refetch with STATS_FORMAT "json"')
+        payload = msgpack.unpackb(body, raw=False, strict_map_key=False)
+    elif magic == MAGIC_ZJSON:
+        payload = json.loads(zlib.decompress(body))
+        payload['days'] = base64.b64decode(payload['days'])
+    else:
+        raise ValueError(f'{path} is not a GitStats snapshot')
+
+    if payload.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f'{path} has snapshot version {payload.get("version")}, expected {SNAPSHOT_VERSION}')
+
+    columns = payload['repositories']
+    rows = zip(*(columns[field] for field in REPO_FIELDS))
+    repos = [dict(zip(REPO_FIELDS, row)) for row in rows]
+    debugLog(load_snapshot, f'Loaded {len(repos)} repositories from {path}', debug, 'DEBUG')
+    return {
+        'user_data': payload['user_data'],
+        'repositories_data': {repo['name']: repo for repo in repos},
+        'data_year': payload['data_year'],
+        'data_day': unpack_days(payload['days_start'], payload['days']),
+        'streak_state': payload.get('streak_state')
+    }
+
+
+def save_stats(data: TotalGitHubData, username: str, stats_format: str = 'snapshot', debug: bool = False) -> str:
+    """Persist a run's data as a compact snapshot, or as indented JSON when exporting."""
+    if stats_format == 'json':
+        path = json_path(username)
+        write_atomic(path, json.dumps(slim_stats(data), indent=4))
+    else:
+        path = snapshot_path(username)
+        dump_snapshot(data, path, debug)
+    debugLog(save_stats, f'Saved stats to {path}', debug, 'SUCCESS')
+    return path
+
+
+def load_stats(username: str, debug: bool = False) -> TotalGitHubData:
+    """Load the newest stored stats, snapshot or JSON; raises FileNotFoundError when there are none."""
+    candidates = [path for path in (snapshot_path(username), json_path(username)) if exists(path)]
+    if not candidates:
+        raise FileNotFoundError(f'No stored stats for {username}')
+
+    path = max(candidates, key=getmtime)
+    debugLog(load_stats, f'Loading stats from {path}', debug, 'DEBUG')
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    return load_snapshot(path, debug)
@@ -1,27 +1,37 @@
 import json
 from datetime import datetime, timedelta
-from os import makedirs
-from os.path import dirname, exists
+from os import replace
+from os.path import exists
 from typing import Any
+from utils.atomic_io import write_atomic
 from utils.customDataTypes import ConfigData
-from base64 import b64encode
-from requests import get
 
-def encode_to_64(image_link: str) -> str: 
-    response = get(image_link)
+def encode_to_64(image_link: str, size: int | None = None) -> str: 
+    from utils.avatar_cache import get_avatar
+    return get_avatar(image_link, size)
 
-    if response.status_code == 200: 
-        image_bytes = response.content
+LEGACY_AUTOCOMMITS_PATH = 'data/auto-commits.json'
 
-        image_encoded = b64encode(image_bytes).decode('utf-8')
+def autocommits_path(username: str) -> str:
+    # One file per account, a batch run must not subtract one account's auto-commits from another's
+    path = f'data/{username}-auto-commits.json'
+    # The shared file predates batch mode, so its history belongs to the account config.json is set up for
+    if not exists(path) and exists(LEGACY_AUTOCOMMITS_PATH):
+        try:
+            owner = load_app().get('USERNAME', '')
+        except (OSError, ValueError):
+            owner = ''
+        if owner.lower() == username.lower():
+            replace(LEGACY_AUTOCOMMITS_PATH, path)
+    return path
 
-        return f'data:image/png;base64,{image_encoded}'
-    else: return ''
-
-def update_autocommits(commits: int, debug: bool = False) -> None:
-    if not exists('data/auto-commits.json'):
-        data_to_write = {str(datetime.today().date()): commits}
-        write_json(data_to_write, 'data/auto-commits.json', 2)
+def autocommits_by_year(autocommits: dict[str, int]) -> dict[str, dict[str, int]]:
+    # Days hold negative counts (see update_json), shaped like the {year: {'auto-commit': n}} entries
+    # GitHubDataFetcher.get_contributions subtracts
+    by_year = {}
+    for day, count in autocommits.items():
+        by_year.setdefault(day[:4], {'auto-commit': 0})['auto-commit'] -= count
+    return by_year
 
 def format_date(date_str, year: bool = True):
     """Format date from YYYY-MM-DD to 'Mon DD, YYYY'"""
@@ -68,11 +78,8 @@ def update_json(filepath: str, increment: int = 1):
     else: data[date] = data[date] - increment
     
     # Write back
-    makedirs(dirname(filepath), exist_ok=True)
-    with open(filepath, "w") as f: json.dump(data, f, indent=2)
+    write_atomic(filepath, json.dumps(data, indent=2))
 
 def write_json(data_to_write: dict, filepath: str = None, indent: int = 2) -> None:
-    dirs = filepath.split('/')
-    dirs = dirs[:-1]
-    makedirs('/'.join(dirs), exist_ok=True)
-    with open(filepath, 'w') as output_file: json.dump(data_to_write, output_file, indent=indent)
\ No newline at end of file
+    # Serialised in memory first, the file on disk is either the old or the new version
+    write_atomic(filepath, json.dumps(data_to_write, indent=indent))
\ No newline at end of file
@@ -0,0 +1,54 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from api.github_client import get_session
+from generators import render
+from generators.data_processor import process_github_data
+from utils.customDataTypes import ConfigData, TotalGitHubData
+from utils.helpers.debug import debugLog
+from workers import fetch_data
+
+
+def account_configs(config: ConfigData) -> list[ConfigData]:
+    # Every entry of ACCOUNTS inherits the top-level settings and overrides what it sets
+    shared = {key: value for key, value in config.items() if key != 'ACCOUNTS'}
+    accounts = config.get('ACCOUNTS') or [{}]
+    return [{**shared, **account} for account in accounts]
+
+
+def committer_config(config: ConfigData) -> ConfigData:
+    # The card commit is pushed for the top-level USERNAME, with that account's own overrides
+    configs = account_configs(config)
+    return next((account for account in configs if account['USERNAME'] == config.get('USERNAME')), configs[0])
+
+
+def fetch_accounts(configs: list[ConfigData], call_API: bool = True, auto_commit: bool = True, workers: int = 4, debug: bool = False) -> list[TotalGitHubData]:
+    debugLog(fetch_accounts, f'Fetching {len(configs)} accounts with {workers} workers', debug, 'DEBUG')
+
+    # Size the shared pool for every account fetching at once
+    get_session(sum(config.get('HTTP_POOL_SIZE', config.get('MAX_WORKERS', 8)) for config in configs[:workers]))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(configs)))) as executor:
+        return list(executor.map(
+            lambda config: fetch_data.fetch_data(config, call_API, auto_commit, debug),
+            configs
+        ))
+
+
+def render_accounts(datasets: list[TotalGitHubData], configs: list[ConfigData], card_indxs: list[int], workers: int | None = None, debug: bool = False) -> list[str]:
+    debugLog(render_accounts, f'Rendering cards {card_indxs} for {len(datasets)} accounts', debug, 'DEBUG')
+
+    # Every (account, model) card is one job on the same render pool
+    snapshots = [(process_github_data(data, config, debug), config) for data, config in zip(datasets, configs)]
+    return render.render_cards(snapshots, card_indxs, workers, debug)
+
+
+def run_batch(config: ConfigData, card_indxs: list[int], call_API: bool = True, auto_commit: bool = True, debug: bool = False) -> list[str]:
+    configs = account_configs(config)
+    debugLog(run_batch, f'Batch run for {[account["USERNAME"] for account in configs]}', debug, 'DEBUG')
+
+    datasets = fetch_accounts(configs, call_API, auto_commit, config.get('BATCH_WORKERS', 4), debug)
+    debugLog(run_batch, f'Fetched data for {len(datasets)} accounts', debug, 'SUCCESS')
+
+    svg_files = render_accounts(datasets, configs, card_indxs, config.get('RENDER_WORKERS'), debug)
+    debugLog(run_batch, f'Generated {len(svg_files)} SVG files', debug, 'SUCCESS')
+    return svg_files
\ No newline at end of file
@@ -1,56 +1,140 @@
+from datetime import date
+
 from api import callers
-from utils.customDataTypes import ConfigData, TotalGitHubData
-from utils.tools import load_json, update_autocommits, write_json
+from stats import streaks
+from utils.customDataTypes import ConfigData, DataByDay, DataByYear, TotalGitHubData
+from utils.datastore import Datastore, datastore_for
+from utils.snapshot import load_stats, save_stats, slim_stats
 from utils.helpers.debug import debugLog
 
+# Days into January during which last year's calendar is still re-fetched,
+# so late contributions (timezones, delayed pushes) land in the right year
+CONTRIBUTIONS_GRACE_DAYS = 7
+
+
+def open_years(today: date, stored: TotalGitHubData | None = None, grace_days: int = CONTRIBUTIONS_GRACE_DAYS) -> list[int]:
+    """Every year from the last one in the stored history through today's, so no year between two runs is left frozen."""
+    first = today.year
+    if stored is not None:
+        last_stored = max(stored['data_day'])[:4] if stored['data_day'] else max(stored['data_year'], key=int)
+        first = min(first, int(last_stored))
+    if today.timetuple().tm_yday <= grace_days:
+        first = min(first, today.year - 1)
+    return list(range(first, today.year + 1))
+
+
+def merge_contributions(stored_year: DataByYear, stored_day: DataByDay, new_year: DataByYear, new_day: DataByDay, years: list[int]) -> tuple[DataByYear, DataByDay]:
+    data_year = {str(year): data for year, data in stored_year.items()}
+    data_year.update({str(year): data for year, data in new_year.items()})
+
+    refetched = tuple(f'{year}-' for year in years)
+    data_day = {day: count for day, count in stored_day.items() if not day.startswith(refetched)}
+    data_day.update(new_day)
+
+    return dict(sorted(data_year.items())), dict(sorted(data_day.items()))
+
 
-def collect_all_data(debug: bool = False) -> TotalGitHubData:
+def rewrites_history(stored_day: DataByDay, data_day: DataByDay, years: list[int], through: str) -> bool:
+    # Only the re-fetched years can differ from what is stored, so only they are compared
+    refetched = tuple(f'{year}-' for year in years)
+    days = {day for day in (*stored_day, *data_day) if day.startswith(refetched) and day <= through}
+    return any(stored_day.get(day, 0) != data_day.get(day, 0) for day in days)
+
+
+def collect_all_data(debug: bool = False, stored: TotalGitHubData | None = None, config: ConfigData | None = None, years: list[int] | None = None) -> TotalGitHubData:
     debugLog(collect_all_data, 'Starting collect_all_data', debug, 'DEBUG')
 
-    data_fetcher = callers.GitHubDataFetcher(debug=debug)
+    data_fetcher = callers.GitHubDataFetcher(debug=debug, config=config)
     debugLog(collect_all_data, 'Initialized GitHubDataFetcher', debug, 'DEBUG')
 
-    profile = data_fetcher.get_profile()
-    debugLog(collect_all_data, f'Fetched profile: {profile}', debug, 'DEBUG')
+    # The fetcher holds connections to the traffic store and datastore
+    try:
+        profile = data_fetcher.get_profile()
+        debugLog(collect_all_data, f'Fetched profile: {profile}', debug, 'DEBUG')
 
-    repos = data_fetcher.get_repos()
-    debugLog(collect_all_data, f'Fetched {len(repos)} repositories', debug, 'DEBUG')
+        repos = data_fetcher.get_repos()
+        debugLog(collect_all_data, f'Fetched {len(repos)} repositories', debug, 'DEBUG')
 
-    languages_used = data_fetcher.get_languages(repos)
-    debugLog(collect_all_data, f'Languages used: {languages_used}', debug, 'DEBUG')
+        languages_used = data_fetcher.get_languages(repos)
+        debugLog(collect_all_data, f'Languages used: {languages_used}', debug, 'DEBUG')
 
-    data_yearly, data_daily = data_fetcher.get_contributions(repos, profile["created_at"])
-    debugLog(collect_all_data, 'Fetched contributions data (yearly and daily)', debug, 'DEBUG')
+        if stored is None:
+            data_yearly, data_daily = data_fetcher.get_contributions(repos, profile["created_at"])
+            debugLog(collect_all_data, 'Fetched contributions data (yearly and daily)', debug, 'DEBUG')
+        else:
+            # Past calendars are frozen, only the open window is fetched again
+            years = years if years is not None else open_years(date.today(), stored)
+            new_yearly, new_daily = data_fetcher.get_contributions(repos, profile["created_at"], years)
+            data_yearly, data_daily = merge_contributions(stored['data_year'], stored['data_day'], new_yearly, new_daily, years)
+            debugLog(collect_all_data, f'Fetched contributions for {years} and merged them into stored history', debug, 'DEBUG')
 
-    return profile, repos, languages_used, data_yearly, data_daily
+        if data_fetcher.cache is not None:
+            debugLog(collect_all_data, f'HTTP cache: {data_fetcher.cache.stats()}', debug, 'DEBUG')
+
+        return profile, repos, languages_used, data_yearly, data_daily
+    finally:
+        data_fetcher.close()
 
 
 def fetch_data(config: ConfigData, call_API: bool = True, auto_commit: bool = True, debug: bool = False) -> TotalGitHubData:
     debugLog(fetch_data, f'Starting fetch_data with call_API={call_API}', debug, 'DEBUG')
 
-    json_data_path = f'data/{config["USERNAME"]}-stats.json'
-    debugLog(fetch_data, f'JSON data path: {json_data_path}', debug, 'DEBUG')
+    # STORAGE_BACKEND "sqlite" keeps everything in the datastore instead of the stats file
+    store = datastore_for(config, debug)
+    try:
+        # Auto-commits are only recorded by GitUpdater once a commit is pushed, a run that
+        # doesn't commit must not count one
+        return _fetch_data(config, store, call_API, debug)
+    finally:
+        if store is not None: store.close()
+
+
+def _fetch_data(config: ConfigData, store: Datastore | None, call_API: bool, debug: bool) -> TotalGitHubData:
+    load = (lambda: store.load_stats(config["USERNAME"])) if store is not None else (lambda: load_stats(config["USERNAME"], debug))
 
     if not call_API:
-        data = load_json(json_data_path)
-        debugLog(fetch_data, f'Loaded data from JSON file: {json_data_path}', debug, 'SUCCESS')
+        data = load()
+        debugLog(_fetch_data, f'Loaded stored data for {config["USERNAME"]}', debug, 'SUCCESS')
         return data
     
-    commits = -1 if auto_commit else 0
-    update_autocommits(commits, debug)
-    debugLog(fetch_data, f'Updated autocommits: {commits}', debug, 'DEBUG')
+    stored = None
+    if config.get('INCREMENTAL_CONTRIBUTIONS', True):
+        try:
+            stored = load()
+        except (OSError, LookupError, ValueError, RuntimeError) as error:
+            debugLog(_fetch_data, f'No usable stored data: {error}', debug, 'WARNING')
+        if stored is not None and (not stored.get('data_year') or 'data_day' not in stored):
+            stored = None
+        debugLog(_fetch_data, f'Reusing stored contributions: {stored is not None}', debug, 'DEBUG')
+
+    # Years re-fetched this run; everything before them is kept as stored
+    years = open_years(date.today(), stored) if stored is not None else None
+    profile, repos, languages, data_year, data_day = collect_all_data(debug, stored, config, years)
+    debugLog(_fetch_data, 'Collected all GitHub data from API', debug, 'DEBUG')
 
-    profile, repos, languages, data_year, data_day = collect_all_data(debug)
-    debugLog(fetch_data, 'Collected all GitHub data from API', debug, 'DEBUG')
+    # Days the stored streak state treats as final must not have changed, otherwise it is rebuilt
+    streak_state = stored.get('streak_state') if stored is not None else None
+    if streak_state and rewrites_history(stored['data_day'], data_day, years, streak_state['frozen_through']):
+        debugLog(_fetch_data, f'Contributions before {streak_state["frozen_through"]} changed, rebuilding streak state', debug, 'WARNING')
+        streak_state = None
+    streak_state, _ = streaks.update_state(streak_state, data_day, date.today(), debug)
 
-    data: TotalGitHubData = {
+    # Slimmed before use, so this run renders from exactly what the next offline run will load
+    data: TotalGitHubData = slim_stats({
         'user_data': profile,
         'repositories_data': repos,
         'data_year': data_year,
-        'data_day': data_day
-    }
-    
-    write_json(data, json_data_path, 4)
-    debugLog(fetch_data, f'Wrote data to JSON file: {json_data_path}', debug, 'SUCCESS')
+        'data_day': data_day,
+        'streak_state': streak_state
+    })
+
+    if store is not None:
+        # Only the re-fetched years are written; reading back gives exactly what offline runs will see
+        store.save_stats(data, years)
+        data = store.load_stats(config["USERNAME"])
+        debugLog(_fetch_data, f'Wrote data to {store.path}', debug, 'SUCCESS')
+    else:
+        stats_path = save_stats(data, config["USERNAME"], config.get('STATS_FORMAT', 'snapshot'), debug)
+        debugLog(_fetch_data, f'Wrote data to {stats_path}', debug, 'SUCCESS')
 
     return data
\ No newline at end of file
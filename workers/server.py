@@ -0,0 +1,156 @@
+import json
+import time
+from collections import OrderedDict
+from hashlib import sha1
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Lock, Thread
+
+from generators.data_processor import process_github_data
+from generators.minifier import minify_svg
+from generators.models.svg_generator import generate_svg
+from generators.render import MODELS_NAME
+from utils.atomic_io import run_lock
+from utils.customDataTypes import ConfigData, ProcessedData
+from utils.helpers.debug import debugLog
+from workers import fetch_data
+from workers.batch import account_configs
+
+CardKey = tuple[str, str, str]  # (user, model, data version)
+
+class CardCache:
+    """LRU cache of rendered cards; entries also expire after `ttl` seconds."""
+
+    def __init__(self, max_entries: int = 128, ttl: float = 7200):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[CardKey, tuple[float, str, str]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: CardKey) -> tuple[str, str] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, svg, etag = entry
+            if time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return svg, etag
+
+    def put(self, key: CardKey, svg: str) -> tuple[str, str]:
+        etag = f'"{sha1(svg.encode("utf-8")).hexdigest()}"'
+        with self._lock:
+            self._entries[key] = (time.time(), svg, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return svg, etag
+
+
+class CardServer:
+    def __init__(self, config: ConfigData, debug: bool = False):
+        self.config = config
+        self.debug = debug
+        self.accounts = {account['USERNAME']: account for account in account_configs(config)}
+        self.models = [model for model in MODELS_NAME if model != 'all']
+        self.refresh_seconds = config.get('SERVE_REFRESH_MINUTES', 60) * 60
+        self.max_age = config.get('SERVE_MAX_AGE', 1800)
+        self.cache = CardCache(config.get('SERVE_CACHE_SIZE', 128), config.get('SERVE_CACHE_TTL', 2 * self.refresh_seconds))
+        self.snapshots: dict[str, tuple[str, ProcessedData]] = {}
+        self._render_lock = Lock()
+        self._stop = Event()
+
+    def refresh(self, call_API: bool = True) -> None:
+        # Same lock as the scheduled runs, which write the same stats; a refresh never waits for one
+        try:
+            with run_lock(timeout=0, debug=self.debug):
+                self._refresh(call_API)
+        except TimeoutError:
+            debugLog(self.refresh, 'Another run holds the lock, skipping this refresh', self.debug, 'WARNING')
+
+    def _refresh(self, call_API: bool) -> None:
+        for username, account in self.accounts.items():
+            try:
+                data = fetch_data.fetch_data(account, call_API, False, self.debug)
+            except Exception as error:
+                # Keep serving the previous snapshot until the next refresh
+                debugLog(self.refresh, f'Refresh failed for {username}: {error}', self.debug, 'ERROR')
+                continue
+
+            version = sha1(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+            if self.snapshots.get(username, (None,))[0] == version:
+                continue
+
+            self.snapshots[username] = (version, process_github_data(data, account, self.debug))
+            for model in self.models:
+                self.card(username, model)
+            debugLog(self.refresh, f'Data for {username} refreshed to version {version}', self.debug, 'SUCCESS')
+
+    def card(self, username: str, model: str) -> tuple[str, str] | None:
+        if username not in self.snapshots or model not in self.models:
+            return None
+
+        version, processed = self.snapshots[username]
+        key = (username, model, version)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Only reached after an eviction; rendering uses the shared random generator
+        with self._render_lock:
+            svg = generate_svg(processed, model, self.debug)
+        if self.config.get('MINIFY_SVG', True):
+            svg = minify_svg(svg, self.config.get('SVG_PRECISION', 2), self.debug)
+        return self.cache.put(key, svg)
+
+    def _refresh_loop(self, call_API: bool) -> None:
+        while not self._stop.wait(self.refresh_seconds):
+            self.refresh(call_API)
+
+    def handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class CardRequestHandler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args) -> None:
+                debugLog(CardRequestHandler, format % args, server.debug, 'DEBUG')
+
+            def do_GET(self) -> None:
+                # /<username>/<model>.svg
+                parts = self.path.split('?', 1)[0].strip('/').split('/')
+                card = None
+                if len(parts) == 2 and parts[1].endswith('.svg'):
+                    card = server.card(parts[0], parts[1][:-len('.svg')])
+
+                if card is None:
+                    self.send_error(404, 'Unknown user or card model')
+                    return
+
+                svg, etag = card
+                status = 304 if self.headers.get('If-None-Match') == etag else 200
+                self.send_response(status)
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', f'public, max-age={server.max_age}, stale-while-revalidate=86400')
+                if status == 304:
+                    self.end_headers()
+                    return
+
+                body = svg.encode('utf-8')
+                self.send_header('Content-Type', 'image/svg+xml; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return CardRequestHandler
+
+    def serve(self, host: str = '127.0.0.1', port: int = 8080, call_API: bool = True) -> None:
+        self.refresh(call_API)
+        Thread(target=self._refresh_loop, args=(call_API,), daemon=True).start()
+
+        httpd = ThreadingHTTPServer((host, port), self.handler())
+        debugLog(self.serve, f'Serving cards on http://{host}:{port}/<username>/<model>.svg', self.debug, 'SUCCESS')
+        try:
+            httpd.serve_forever()
+        finally:
+            self._stop.set()
+            httpd.server_close()
\ No newline at end of file